@@ -0,0 +1,27 @@
+"""
+ASGI config for Django Template project.
+
+This module contains the ASGI application used by ASGI servers such as uvicorn
+(``gunicorn -k uvicorn_worker.UvicornWorker config.asgi``). It exposes a
+module-level variable named ``application``.
+
+Under ASGI a single worker serves many concurrent requests on one event loop;
+set ``DJANGO_ASYNC_VIEWS=True`` to route the catalog and people pages to their
+async views so slow clients don't each hold a thread.
+
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# django_template directory.
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "django_template"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+# This application object is used by any ASGI server configured to use this file.
+application = get_asgi_application()
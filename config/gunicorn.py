@@ -0,0 +1,82 @@
+"""
+Gunicorn configuration, used by ``gunicorn -c config/gunicorn.py``.
+
+Every setting can be tuned through the environment; by default the worker
+count is sized from the CPUs available to the container.
+
+``GUNICORN_WORKER_CLASS``
+    ``sync`` (default): one request per process, the safest choice.
+    ``gthread``: ``GUNICORN_THREADS`` requests per process, for I/O-bound load.
+    ``uvicorn``: serves ``config.asgi`` on an event loop and switches the web
+    app to its async views, through the ``uvicorn-worker`` package.
+``WEB_CONCURRENCY``
+    Worker processes. Defaults to ``2 * CPUs + 1`` for sync workers and to the
+    CPU count for threaded and async workers.
+``GUNICORN_PRELOAD``
+    Import the application once in the master before forking, so workers
+    share its memory copy-on-write and boot faster (default ``true``).
+``GUNICORN_MAX_REQUESTS`` / ``GUNICORN_MAX_REQUESTS_JITTER``
+    Recycle workers after a randomised number of requests to contain memory
+    growth without restarting every worker at once.
+"""
+
+import os
+
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "uvicorn": "uvicorn_worker.UvicornWorker",
+}
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.environ.get(name, "")
+    return int(value) if value.strip() else default
+
+
+def env_bool(name: str, *, default: bool) -> bool:
+    value = os.environ.get(name, "")
+    if not value.strip():
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def available_cpus() -> int:
+    """Return the CPUs this process may run on (respects container limits)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+mode = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+if mode not in WORKER_CLASSES:
+    msg = f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}."
+    raise ValueError(msg)
+cpus = available_cpus()
+
+worker_class = WORKER_CLASSES[mode]
+workers = env_int("WEB_CONCURRENCY", 2 * cpus + 1 if mode == "sync" else cpus)
+threads = env_int("GUNICORN_THREADS", 4) if mode == "gthread" else 1
+if mode == "uvicorn":
+    wsgi_app = "config.asgi:application"
+    os.environ.setdefault("DJANGO_ASYNC_VIEWS", "True")
+else:
+    wsgi_app = "config.wsgi:application"
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+preload_app = env_bool("GUNICORN_PRELOAD", default=True)
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = env_int("GUNICORN_KEEPALIVE", 5)
+
+
+def pre_fork(server, worker):
+    # With preload_app the master may have opened database connections while
+    # importing the app. Close them before forking: workers must never share a
+    # connection, and closing it in a child would also end the parent's.
+    if preload_app:
+        from django.db import connections  # noqa: PLC0415
+
+        connections.close_all()
@@ -3,6 +3,7 @@ import ssl
 from pathlib import Path
 
 import environ
+from celery.schedules import crontab
 
 # UNFOLD CONFIGURATION
 # ------------------------------------------------------------------------------
@@ -53,6 +54,25 @@ LOCALE_PATHS = [str(BASE_DIR / "locale")]
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {"default": env.db("DATABASE_URL")}
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Views marked read-only skip ATOMIC_REQUESTS; run them in READ ONLY transactions
+# instead of autocommit (django_template.apps.shared.transactions).
+READ_ONLY_VIEW_TRANSACTIONS = env.bool(
+    "DJANGO_READ_ONLY_VIEW_TRANSACTIONS",
+    default=False,
+)
+# Read replicas, e.g. DJANGO_DATABASE_REPLICA_URLS=postgres://replica-1/db,postgres://replica-2/db
+DATABASE_REPLICAS = []
+for _index, _url in enumerate(env.list("DJANGO_DATABASE_REPLICA_URLS", default=[])):
+    _alias = f"replica_{_index + 1}"
+    DATABASES[_alias] = {**env.db_url_config(_url), "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(_alias)
+# https://docs.djangoproject.com/en/dev/topics/db/multi-db/#automatic-database-routing
+DATABASE_ROUTERS = ["django_template.apps.shared.routers.ReplicaRouter"]
+# Seconds a client reads from the primary after writing (covers replication lag).
+DATABASE_REPLICA_PIN_SECONDS = env.int(
+    "DJANGO_DATABASE_REPLICA_PIN_SECONDS",
+    default=10,
+)
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -62,6 +82,10 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 ROOT_URLCONF = "config.urls"
 # https://docs.djangoproject.com/en/dev/ref/settings/#wsgi-application
 WSGI_APPLICATION = "config.wsgi.application"
+# https://docs.djangoproject.com/en/dev/howto/deployment/asgi/
+ASGI_APPLICATION = "config.asgi.application"
+# Serve the catalog and people pages from their async views (use under ASGI).
+ASYNC_VIEWS = env.bool("DJANGO_ASYNC_VIEWS", default=False)
 
 # UNFOLD
 # ------------------------------------------------------------------------------
@@ -136,6 +160,22 @@ LOCAL_APPS = [
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
 INSTALLED_APPS = UNFOLD_APPS + DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
+# Admin and CMS apps, which dominate boot time (see `manage.py importtime`).
+# Celery workers and API-only pods can skip them with DJANGO_APP_PROFILE=slim.
+ADMIN_CMS_APPS = [
+    # location_field stays: the demo model uses its field.
+    *(app for app in UNFOLD_APPS if not app.startswith("location_field")),
+    "django.contrib.admin",
+    *(app for app in THIRD_PARTY_APPS if app.startswith("wagtail")),
+    "modelcluster",
+    "taggit",
+    "import_export",
+    "schema_viewer",
+    "data_browser",
+]
+APP_PROFILE = env("DJANGO_APP_PROFILE", default="full")
+if APP_PROFILE == "slim":
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ADMIN_CMS_APPS]
 
 # MIGRATIONS
 # ------------------------------------------------------------------------------
@@ -186,16 +226,19 @@ MIDDLEWARE = [
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "django_template.apps.shared.middleware.ReplicaPinningMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
-    # auditlog
-    "auditlog.middleware.AuditlogMiddleware",
+    # auditlog: resolves the actor only when a registered model is written
+    "django_template.apps.shared.middleware.LazyAuditlogMiddleware",
     # wagtail
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
 ]
+if APP_PROFILE == "slim":
+    MIDDLEWARE.remove("wagtail.contrib.redirects.middleware.RedirectMiddleware")
 
 # STATIC
 # ------------------------------------------------------------------------------
@@ -375,6 +418,18 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 CELERY_TASK_SOFT_TIME_LIMIT = 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-schedule
+CELERY_BEAT_SCHEDULE = {
+    "archive-audit-log": {
+        "task": "django_template.apps.shared.tasks.archive_audit_log",
+        "schedule": crontab(hour=3, minute=15),
+    },
+    # Catches up on car writes that bypass model signals (bulk_create, COPY).
+    "refresh-car-facets": {
+        "task": "django_template.apps.shared.tasks.refresh_car_facets",
+        "schedule": crontab(minute="*/15"),
+    },
+}
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-send-task-events
 CELERY_WORKER_SEND_TASK_EVENTS = True
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_send_sent_event
@@ -474,6 +529,14 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
+# Serve list endpoints that support it from values() rows instead of model
+# serializers (see django_template.apps.api.serializers.PublicUserListSerializer).
+API_FAST_SERIALIZATION = env.bool("DJANGO_API_FAST_SERIALIZATION", default=False)
+# Seconds a user's cached `/api/users/me/` payload is kept (versioned on save).
+API_ME_CACHE_TIMEOUT = env.int("DJANGO_API_ME_CACHE_TIMEOUT", default=3600)
+# Seconds a per-row data version is kept; at least API_ME_CACHE_TIMEOUT, which
+# caches payloads under it (django_template.apps.shared.caching).
+DATA_VERSION_ROW_TIMEOUT = env.int("DJANGO_DATA_VERSION_ROW_TIMEOUT", default=3600)
 
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
 CORS_URLS_REGEX = r"^/api/.*$"
@@ -489,6 +552,34 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Write auditlog entries in batches from Celery once the change commits
+# (django_template.apps.shared.audit) instead of inside the request transaction.
+AUDITLOG_ASYNC = env.bool("DJANGO_AUDITLOG_ASYNC", default=False)
+# Buffered auditlog entries handed to one Celery task.
+AUDITLOG_BATCH_SIZE = env.int("DJANGO_AUDITLOG_BATCH_SIZE", default=500)
+# Bulk admin actions and imports touching at least this many rows are logged as one
+# auditlog changeset entry instead of one entry per row.
+AUDITLOG_BULK_THRESHOLD = env.int("DJANGO_AUDITLOG_BULK_THRESHOLD", default=20)
+# Auditlog entries are kept for the month this many days ago and every month since;
+# older ones are archived to the default storage nightly.
+AUDITLOG_RETENTION_DAYS = env.int("DJANGO_AUDITLOG_RETENTION_DAYS", default=365)
+# Seconds between a car write and the facet summary rebuild it queues; writes in
+# between share that rebuild (django_template.apps.shared.facets).
+CAR_FACET_REFRESH_DELAY = env.int("DJANGO_CAR_FACET_REFRESH_DELAY", default=30)
+# Seconds a cached queryset count stays valid (django_template.apps.shared.counts).
+COUNT_CACHE_TIMEOUT = env.int("DJANGO_COUNT_CACHE_TIMEOUT", default=300)
+# Tables estimated above this many rows report planner estimates instead of COUNT(*).
+COUNT_ESTIMATE_THRESHOLD = env.int(
+    "DJANGO_COUNT_ESTIMATE_THRESHOLD",
+    default=1_000_000,
+)
+# Seconds a rendered HTMX fragment stays cached (django_template.apps.web.fragments).
+FRAGMENT_CACHE_TIMEOUT = env.int("DJANGO_FRAGMENT_CACHE_TIMEOUT", default=300)
+# `manage.py check --database default` fails on sequential scans of larger tables.
+QUERY_PLAN_SEQ_SCAN_MAX_ROWS = env.int(
+    "DJANGO_QUERY_PLAN_SEQ_SCAN_MAX_ROWS",
+    default=10_000,
+)
 
 # UNFOLD CONFIGURATION
 # ------------------------------------------------------------------------------
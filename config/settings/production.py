@@ -23,7 +23,27 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["devopssean.netlify.ap
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+# https://docs.djangoproject.com/en/dev/ref/databases/#connection-pool
+# Pooling needs the psycopg-pool package (psycopg[pool]) and replaces persistent
+# connections, so CONN_MAX_AGE is forced to 0 when it is enabled.
+DATABASE_POOL = env.bool("DJANGO_DATABASE_POOL", default=False)
+# Behind PgBouncer in transaction mode, server-side cursors (QuerySet.iterator())
+# break because consecutive statements may run on different server connections.
+DATABASE_PGBOUNCER = env.bool("DJANGO_DATABASE_PGBOUNCER", default=False)
+for _database in DATABASES.values():
+    _database["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+    # https://docs.djangoproject.com/en/dev/ref/settings/#conn-health-checks
+    _database["CONN_HEALTH_CHECKS"] = env.bool("CONN_HEALTH_CHECKS", default=True)
+    if DATABASE_POOL:
+        _database["CONN_MAX_AGE"] = 0
+        _database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": env.int("DJANGO_DATABASE_POOL_MIN_SIZE", default=2),
+            "max_size": env.int("DJANGO_DATABASE_POOL_MAX_SIZE", default=10),
+            # Seconds a request waits for a free connection before failing.
+            "timeout": env.float("DJANGO_DATABASE_POOL_TIMEOUT", default=10),
+        }
+    if DATABASE_PGBOUNCER:
+        _database["DISABLE_SERVER_SIDE_CURSORS"] = True
 
 # CACHES
 # ------------------------------------------------------------------------------
@@ -38,8 +58,34 @@ CACHES = {
             "IGNORE_EXCEPTIONS": True,
         },
     },
+    # Sessions must not be silently dropped, and should live in a Redis database
+    # that never evicts (noeviction), unlike the default cache.
+    "sessions": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": env("DJANGO_SESSION_REDIS_URL", default=REDIS_URL),
+        "KEY_PREFIX": "sessions",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+        },
+    },
 }
 
+# SESSIONS
+# ------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/dev/ref/settings/#session-engine
+# Redis-backed sessions that move old database sessions over on first use while
+# SESSION_DB_FALLBACK is on; run `manage.py drain_db_sessions` after deploying
+# to move the rest.
+SESSION_ENGINE = env(
+    "DJANGO_SESSION_ENGINE",
+    default="django_template.apps.shared.sessions",
+)
+# https://docs.djangoproject.com/en/dev/ref/settings/#session-cache-alias
+SESSION_CACHE_ALIAS = "sessions"
+# Look up cache misses in the old django_session table. Set to False once
+# `manage.py drain_db_sessions` has run.
+SESSION_DB_FALLBACK = env.bool("DJANGO_SESSION_DB_FALLBACK", default=True)
+
 # SECURITY
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#secure-proxy-ssl-header
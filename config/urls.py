@@ -1,3 +1,4 @@
+from django.apps import apps
 from django.conf import settings
 from django.conf.urls.i18n import i18n_patterns  # changelog-0.7.0
 from django.conf.urls.static import static
@@ -9,9 +10,6 @@ from django.views.generic import TemplateView
 from drf_spectacular.views import SpectacularAPIView
 from drf_spectacular.views import SpectacularSwaggerView
 from rest_framework.authtoken.views import obtain_auth_token
-from wagtail import urls as wagtail_urls
-from wagtail.admin import urls as wagtailadmin_urls
-from wagtail.documents import urls as wagtaildocs_urls
 
 urlpatterns = [
     # Language switcher endpoint (must NOT be inside i18n_patterns)
@@ -27,8 +25,6 @@ urlpatterns += (
         TemplateView.as_view(template_name="pages/about.html"),
         name="about",
     ),
-    # Django Admin, use {% url 'admin:index' %}
-    path(settings.ADMIN_URL, admin.site.urls),
     # User management
     path("users/", include("django_template.users.urls", namespace="users")),
     path("accounts/", include("allauth.urls")),
@@ -38,6 +34,11 @@ urlpatterns += (
     *static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT),
 )
 
+# Django Admin, use {% url 'admin:index' %}
+# Admin and CMS apps are not installed with DJANGO_APP_PROFILE=slim.
+if apps.is_installed("django.contrib.admin"):
+    urlpatterns += [path(settings.ADMIN_URL, admin.site.urls)]
+
 # API URLS
 urlpatterns += [
     # API base url
@@ -55,11 +56,16 @@ urlpatterns += [
 
 # WAGTAIL URLS
 # https://docs.wagtail.org/en/stable/getting_started/integrating_into_django.html
-urlpatterns += [
-    path("cms/", include(wagtailadmin_urls)),
-    path("documents/", include(wagtaildocs_urls)),
-    path("pages/", include(wagtail_urls)),
-]
+if apps.is_installed("wagtail"):
+    from wagtail import urls as wagtail_urls
+    from wagtail.admin import urls as wagtailadmin_urls
+    from wagtail.documents import urls as wagtaildocs_urls
+
+    urlpatterns += [
+        path("cms/", include(wagtailadmin_urls)),
+        path("documents/", include(wagtaildocs_urls)),
+        path("pages/", include(wagtail_urls)),
+    ]
 
 # Localised URL patterns (these will have /en/, /pl/, /de/ prefixes)
 urlpatterns += i18n_patterns()
@@ -84,9 +90,11 @@ if settings.DEBUG:
             kwargs={"exception": Exception("Page not Found")},
         ),
         path("500/", default_views.server_error),
-        path("schema-viewer/", include("schema_viewer.urls")),
-        path("data-browser/", include("data_browser.urls")),
     ]
+    if apps.is_installed("schema_viewer"):
+        urlpatterns += [path("schema-viewer/", include("schema_viewer.urls"))]
+    if apps.is_installed("data_browser"):
+        urlpatterns += [path("data-browser/", include("data_browser.urls"))]
     if "debug_toolbar" in settings.INSTALLED_APPS:
         import debug_toolbar
 
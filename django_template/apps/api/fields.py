@@ -0,0 +1,26 @@
+from rest_framework import serializers
+
+from .reversing import url_template
+
+
+class CachedHyperlinkedIdentityField(serializers.HyperlinkedIdentityField):
+    """
+    ``HyperlinkedIdentityField`` that formats integer ids into a cached route.
+
+    Falls back to DRF's regular reversing for non-integer lookups, format
+    suffixes and API versioning, which the cached template does not cover.
+    """
+
+    def get_url(self, obj, view_name, request, format):  # noqa: A002
+        if hasattr(obj, "pk") and obj.pk in (None, ""):
+            return None
+        lookup_value = getattr(obj, self.lookup_field)
+        versioned = getattr(request, "versioning_scheme", None) is not None
+        template = None
+        if isinstance(lookup_value, int) and format is None and not versioned:
+            template = url_template(view_name, self.lookup_url_kwarg)
+        if template is None:
+            return super().get_url(obj, view_name, request, format)
+        prefix, suffix = template
+        path = f"{prefix}{lookup_value}{suffix}"
+        return request.build_absolute_uri(path) if request is not None else path
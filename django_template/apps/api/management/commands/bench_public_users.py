@@ -0,0 +1,61 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from rest_framework.renderers import JSONRenderer
+
+from django_template.apps.api.serializers import PUBLIC_USER_FIELDS
+from django_template.apps.api.serializers import PublicUserSerializer
+from django_template.apps.shared.services import list_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the model serializer against the values() fast path for "
+        "public users and verifies both render byte-identical JSON. The time "
+        "of the query alone is reported as the floor either path can reach."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=1_000,
+            help="Number of users serialized per run.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of timed runs per mode; the best run is reported.",
+        )
+
+    def handle(self, *args, **options):
+        limit, repeat = options["limit"], options["repeat"]
+        renderer = JSONRenderer()
+
+        def model_path():
+            users = list(list_users()[:limit])
+            data = PublicUserSerializer(users, many=True).data
+            return renderer.render(data)
+
+        def fast_path():
+            users = list(list_users().values(*PUBLIC_USER_FIELDS)[:limit])
+            data = PublicUserSerializer(users, many=True).data
+            return renderer.render(data)
+
+        def query_only():
+            return list(list_users().values(*PUBLIC_USER_FIELDS)[:limit])
+
+        if model_path() != fast_path():
+            msg = "Fast path output differs from the model serializer output."
+            raise CommandError(msg)
+
+        for name, func in (
+            ("model serializer", model_path),
+            ("fast path", fast_path),
+            ("query only", query_only),
+        ):
+            best = min(timeit.repeat(func, number=1, repeat=repeat))
+            self.stdout.write(f"{name:>16}: {best * 1000:8.2f} ms for {limit} users")
+        self.stdout.write(self.style.SUCCESS("Outputs are byte-identical."))
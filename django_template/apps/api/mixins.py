@@ -0,0 +1,45 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from django_template.apps.shared.caching import get_data_version
+
+
+class ConditionalListMixin:
+    """
+    Answer ``list`` requests with ``304 Not Modified`` when nothing changed.
+
+    The validators are derived from the model's data version (bumped on every
+    save and delete) and the highest primary key, so checking them costs one
+    cache read and one index-only query instead of a full serialization.
+    """
+
+    def get_list_validators(self, request: Request) -> tuple[str, int]:
+        """Return the ``(etag, last_modified)`` validators for a list request."""
+        queryset = self.get_queryset()  # type: ignore[attr-defined]
+        version = get_data_version(queryset.model)
+        latest = queryset.order_by("-pk").values_list("pk", flat=True).first()
+        # Each page and each renderer (JSON, browsable API) is a distinct variant.
+        query = request.META.get("QUERY_STRING", "")
+        variant = hashlib.blake2b(
+            f"{request.accepted_renderer.format}?{query}".encode(),
+            digest_size=8,
+        ).hexdigest()
+        return f'W/"{version}-{latest}-{variant}"', version // 1_000_000_000
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        etag, last_modified = self.get_list_validators(request)
+        not_modified = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        if not_modified is not None:
+            return not_modified  # type: ignore[return-value]
+        response = super().list(request, *args, **kwargs)  # type: ignore[misc]
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
@@ -0,0 +1,58 @@
+"""Precompiled URL reversing for integer primary keys.
+
+``django.urls.reverse`` walks the resolver and checks the candidate patterns on
+every call, which adds up when a serializer hyperlinks every row of a large
+response. Here a route is reversed once per process (per URLconf, script
+prefix and language) with a sentinel id, and the resulting path is kept as a
+``(prefix, suffix)`` template that later ids are formatted into.
+"""
+
+from functools import lru_cache
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import NoReverseMatch
+from django.urls import get_script_prefix
+from django.urls import get_urlconf
+from django.urls import reverse
+from django.utils.translation import get_language
+
+# Any integer route converter accepts this, and it cannot collide with the
+# digits of the surrounding path.
+SENTINEL_ID = 918273645546372819
+
+
+@lru_cache(maxsize=256)
+def _compile(
+    view_name: str,
+    kwarg: str,
+    urlconf: str | None,
+    script_prefix: str,
+    language: str | None,
+) -> tuple[str, str] | None:
+    try:
+        path = reverse(view_name, urlconf=urlconf, kwargs={kwarg: SENTINEL_ID})
+    except NoReverseMatch:
+        return None
+    prefix, sep, suffix = path.partition(str(SENTINEL_ID))
+    if not sep or str(SENTINEL_ID) in suffix:
+        return None
+    return prefix, suffix
+
+
+@receiver(setting_changed)
+def _clear_templates(*, setting, **kwargs):
+    if setting == "ROOT_URLCONF":
+        _compile.cache_clear()
+
+
+def url_template(view_name: str, kwarg: str = "pk") -> tuple[str, str] | None:
+    """
+    Return the ``(prefix, suffix)`` around the id in ``view_name``'s path.
+
+    Returns ``None`` when the route cannot be reversed with an integer id, in
+    which case callers should fall back to ``reverse``.
+    """
+    return _compile(
+        view_name, kwarg, get_urlconf(), get_script_prefix(), get_language()
+    )
@@ -3,8 +3,35 @@ from rest_framework import serializers
 
 User = get_user_model()
 
+PUBLIC_USER_FIELDS = ("id", "email", "name")
+
+
+class PublicUserListSerializer(serializers.ListSerializer):
+    """
+    List serializer with a fast path for ``values()`` rows.
+
+    Rows fetched with ``.values(*PUBLIC_USER_FIELDS)`` already have exactly the
+    shape ``PublicUserSerializer`` produces, so they are passed through as-is
+    instead of running field introspection and ``to_representation`` per row.
+    """
+
+    def to_representation(self, data):
+        if isinstance(data, list) and all(isinstance(row, dict) for row in data):
+            return data
+        return super().to_representation(data)
+
 
 class PublicUserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ("id", "email", "name")
+        fields = PUBLIC_USER_FIELDS
+        list_serializer_class = PublicUserListSerializer
+
+
+class UserExportQuerySerializer(serializers.Serializer):
+    """Query parameters of the public user export."""
+
+    # Bounded by the id column (bigint), so a huge value can't overflow it.
+    since_id = serializers.IntegerField(
+        min_value=0, max_value=2**63 - 1, required=False
+    )
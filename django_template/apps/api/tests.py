@@ -1 +1,145 @@
-# Create your tests here.
+import csv
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.urls import set_script_prefix
+from rest_framework.test import APIClient
+
+from django_template.apps.api.reversing import url_template
+from django_template.users.api.serializers import UserSerializer
+from django_template.users.models import User
+from django_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+PUBLIC_USERS_URL = "/api/public-users/"
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+class TestPublicUserViewSet:
+    def test_cursor_pagination(self, api_client: APIClient, user: User):
+        others = UserFactory.create_batch(2)
+
+        first = api_client.get(PUBLIC_USERS_URL, {"page_size": 2}).json()
+        second = api_client.get(first["next"]).json()
+
+        ids = [row["id"] for row in first["results"] + second["results"]]
+        assert ids == [user.pk, *(other.pk for other in others)]
+        assert set(first) == {"next", "previous", "results"}
+        assert second["next"] is None
+
+    def test_not_modified_until_users_change(self, api_client: APIClient):
+        response = api_client.get(PUBLIC_USERS_URL)
+        etag = response["ETag"]
+
+        cached = api_client.get(
+            PUBLIC_USERS_URL,
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        assert cached.status_code == HTTPStatus.NOT_MODIFIED
+
+        UserFactory()
+        changed = api_client.get(
+            PUBLIC_USERS_URL,
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        assert changed.status_code == HTTPStatus.OK
+        assert changed["ETag"] != etag
+
+    def test_pages_have_distinct_etags(self, api_client: APIClient):
+        UserFactory.create_batch(2)
+        first = api_client.get(PUBLIC_USERS_URL, {"page_size": 1})
+        second = api_client.get(first.json()["next"])
+        assert first["ETag"] != second["ETag"]
+
+
+class TestFastSerialization:
+    def test_byte_identical_output(self, api_client: APIClient, settings):
+        UserFactory.create_batch(3, name='Zoë "quoted" \\ name')
+
+        settings.API_FAST_SERIALIZATION = False
+        slow = api_client.get(PUBLIC_USERS_URL)
+        settings.API_FAST_SERIALIZATION = True
+        fast = api_client.get(PUBLIC_USERS_URL)
+
+        assert fast.content == slow.content
+
+    def test_benchmark_command(self):
+        UserFactory.create_batch(2)
+        out = StringIO()
+        call_command("bench_public_users", "--repeat", "1", stdout=out)
+        assert "query only" in out.getvalue()
+        assert "byte-identical" in out.getvalue()
+
+
+class TestPublicUserExport:
+    url = f"{PUBLIC_USERS_URL}export/"
+
+    def test_ndjson_by_default(self, api_client: APIClient, user: User):
+        other = UserFactory()
+
+        response = api_client.get(self.url)
+
+        assert response.streaming
+        assert response["Content-Type"].startswith("application/x-ndjson")
+        lines = response.getvalue().decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert [row["id"] for row in rows] == [user.pk, other.pk]
+        assert set(rows[0]) == {"id", "email", "name"}
+
+    def test_csv(self, api_client: APIClient, user: User):
+        response = api_client.get(self.url, {"format": "csv"})
+
+        assert response["Content-Type"].startswith("text/csv")
+        content = response.getvalue().decode()
+        header, row = list(csv.reader(StringIO(content)))
+        assert header == ["id", "email", "name"]
+        assert row == [str(user.pk), user.email, user.name]
+
+    def test_since_id(self, api_client: APIClient, user: User):
+        other = UserFactory()
+
+        response = api_client.get(self.url, {"since_id": user.pk})
+
+        lines = response.getvalue().decode().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [other.pk]
+
+    @pytest.mark.parametrize("since_id", ["abc", "²", "-1", str(2**64)])
+    def test_invalid_since_id(self, api_client: APIClient, since_id: str):
+        response = api_client.get(self.url, {"since_id": since_id})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+class TestPrecompiledReverse:
+    def test_matches_reverse(self):
+        template = url_template("api:user-detail")
+        assert template is not None
+        prefix, suffix = template
+        for pk in (1, 42, 10**12):
+            expected = reverse("api:user-detail", kwargs={"pk": pk})
+            assert f"{prefix}{pk}{suffix}" == expected
+
+    def test_follows_script_prefix(self):
+        try:
+            set_script_prefix("/mounted/")
+            assert url_template("api:user-detail") == ("/mounted/api/users/", "/")
+        finally:
+            set_script_prefix("/")
+
+    def test_unreversible_route(self):
+        assert url_template("api:user-list") is None
+
+    def test_user_serializer_url(self, rf, user: User):
+        request = rf.get("/")
+        data = UserSerializer(user, context={"request": request}).data
+        assert data["url"] == f"http://testserver/api/users/{user.pk}/"
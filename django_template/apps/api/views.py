@@ -1,16 +1,90 @@
+import csv
+import json
+from collections.abc import Iterable
+from collections.abc import Iterator
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework import permissions
 from rest_framework import viewsets
+from rest_framework.decorators import action
 
 from django_template.apps.shared.services import list_users
+from django_template.apps.shared.transactions import ReadOnlyViewMixin
 
+from .mixins import ConditionalListMixin
+from .pagination import IdCursorPagination
+from .renderers import CSVRenderer
+from .renderers import NDJSONRenderer
+from .serializers import PUBLIC_USER_FIELDS
 from .serializers import PublicUserSerializer
+from .serializers import UserExportQuerySerializer
+
+EXPORT_CHUNK_SIZE = 2_000
 
 # Create your views here.
 
 
-class PublicUserViewSet(viewsets.ReadOnlyModelViewSet):
+class Echo:
+    """File-like object whose ``write`` returns the value, for streaming CSV."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def ndjson_lines(rows: Iterable[tuple], fields: tuple[str, ...]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(dict(zip(fields, row, strict=True)), ensure_ascii=False) + "\n"
+
+
+def csv_lines(rows: Iterable[tuple], fields: tuple[str, ...]) -> Iterator[str]:
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+class PublicUserViewSet(
+    ReadOnlyViewMixin,
+    ConditionalListMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
     serializer_class = PublicUserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = IdCursorPagination
 
     def get_queryset(self):
-        return list_users()
+        users = list_users()
+        if self.action == "list" and settings.API_FAST_SERIALIZATION:
+            # Plain dict rows skip per-object serialization entirely.
+            return users.values(*PUBLIC_USER_FIELDS)
+        return users
+
+    @action(
+        detail=False,
+        renderer_classes=[NDJSONRenderer, CSVRenderer],
+        pagination_class=None,
+    )
+    def export(self, request):
+        """
+        Stream every public user as NDJSON (default) or CSV (``?format=csv``).
+
+        Rows are read through a server-side cursor and written as they arrive,
+        so memory stays constant regardless of the number of users. Pass
+        ``?since_id=<id>`` to only fetch users created after a previous pull.
+        """
+        query = UserExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        users = list_users()
+        since_id = query.validated_data.get("since_id")
+        if since_id is not None:
+            users = users.filter(id__gt=since_id)
+        rows = users.values_list(*PUBLIC_USER_FIELDS).iterator(
+            chunk_size=EXPORT_CHUNK_SIZE,
+        )
+        renderer = request.accepted_renderer
+        lines = csv_lines if renderer.format == "csv" else ndjson_lines
+        return StreamingHttpResponse(
+            lines(rows, PUBLIC_USER_FIELDS),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
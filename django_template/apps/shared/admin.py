@@ -5,68 +5,57 @@ This module demonstrates a comprehensive Unfold admin integration that:
 - Integrates django-import-export for data import/export capabilities.
 - Demonstrates configuration of tabs, filters, and fieldsets.
 - Automatically styles all forms through Unfolds form and widget overrides.
+- Logs bulk actions and imports as single auditlog changesets.
+- Runs large CSV imports as chunked background jobs.
 """
 
 from django import forms
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.core.validators import FileExtensionValidator
 from django.db import models
-from import_export import resources
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.utils.translation import gettext_lazy as _
 from import_export.admin import ImportExportModelAdmin
 from unfold.admin import ModelAdmin
 from unfold.contrib.forms.widgets import ArrayWidget
 from unfold.contrib.forms.widgets import WysiwygWidget
 from unfold.contrib.import_export.forms import ExportForm
 from unfold.contrib.import_export.forms import ImportForm
+from unfold.decorators import action
+from unfold.widgets import UnfoldAdminFileFieldWidget
 from unfold.widgets import UnfoldAdminSelectWidget
 from unfold.widgets import UnfoldAdminTextInputWidget
 
+from django_template.apps.shared.audit import bulk_audit
 from django_template.apps.shared.models.cars.models import Car
 from django_template.apps.shared.models.demo.models import DemoCategory
 from django_template.apps.shared.models.demo.models import UnfoldDemoModel
+from django_template.apps.shared.models.imports.models import ImportJob
+from django_template.apps.shared.resources import UnfoldDemoResource
+from django_template.apps.shared.tasks import run_import
 
 
 # ---------------------------------------------------------------------
-# django-import-export Resource
+# Bulk action auditing
 # ---------------------------------------------------------------------
-class UnfoldDemoResource(resources.ModelResource):
+class BulkAuditMixin:
     """
-    Defines how `UnfoldDemoModel` data is imported and exported.
-
-    This resource class controls which fields are serialised and in what order.
-    It ensures that unchanged records are skipped and that model instances are
-    cleaned before saving.
-
-    Attributes:
-        model: Target model for import/export operations.
-        skip_unchanged: Whether unchanged rows are ignored.
-        report_skipped: Whether skipped rows are shown in reports.
-        clean_model_instances: Whether to run model cleaning before saving.
-        fields: Explicit list of fields to include in export/import.
-        export_order: Defines column order in exported datasets.
+    Log changelist actions on many rows as one auditlog changeset.
+
+    Actions affecting at least ``AUDITLOG_BULK_THRESHOLD`` rows record a
+    single entry with the affected ids and field deltas instead of one diff
+    per row (see ``django_template.apps.shared.audit.bulk_audit``).
     """
 
-    class Meta:
-        model = UnfoldDemoModel
-        skip_unchanged = True
-        report_skipped = True
-        clean_model_instances = True
-        fields = (
-            "id",
-            "title",
-            "subtitle",
-            "status",
-            "is_active",
-            "rating",
-            "published_on",
-            "publish_time",
-            "last_reviewed_at",
-            "tags",
-            "metadata",
-            "category__name",
-            "address",
-            "location",
-        )
-        export_order = fields
+    def response_action(self, request, queryset):
+        if request.POST.get("select_across") == "1":
+            size = queryset.count()
+        else:
+            size = len(request.POST.getlist(helpers.ACTION_CHECKBOX_NAME))
+        with bulk_audit(queryset.model, size):
+            return super().response_action(request, queryset)  # type: ignore[misc]
 
 
 # ---------------------------------------------------------------------
@@ -116,11 +105,21 @@ class UnfoldDemoForm(forms.ModelForm):
         }
 
 
+class BackgroundImportForm(forms.Form):
+    """Upload form for a background CSV import."""
+
+    import_file = forms.FileField(
+        label=_("CSV file"),
+        validators=[FileExtensionValidator(["csv"])],
+        widget=UnfoldAdminFileFieldWidget,
+    )
+
+
 # ---------------------------------------------------------------------
 # Unfold Admin Registrations + ImportExport Admin
 # ---------------------------------------------------------------------
 @admin.register(UnfoldDemoModel)
-class UnfoldDemoAdmin(ModelAdmin, ImportExportModelAdmin):
+class UnfoldDemoAdmin(BulkAuditMixin, ModelAdmin, ImportExportModelAdmin):
     """
     Comprehensive Unfold admin integration for UnfoldDemoModel.
 
@@ -143,6 +142,9 @@ class UnfoldDemoAdmin(ModelAdmin, ImportExportModelAdmin):
     # Use the Unfold-styled form defined above.
     form = UnfoldDemoForm
 
+    # Changelist button for imports too large for a single request.
+    actions_list = ["background_import"]
+
     # --- Django admin configuration ---
     list_display = (
         "title",
@@ -193,9 +195,34 @@ class UnfoldDemoAdmin(ModelAdmin, ImportExportModelAdmin):
         "Location": {"fields": ("address", "location")},
     }
 
+    @action(
+        description=_("Background import"),
+        url_path="background-import",
+        permissions=["import"],
+    )
+    def background_import(self, request):
+        """Store an uploaded CSV file and import it with a Celery job."""
+        form = BackgroundImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            job = ImportJob.objects.create(
+                resource="unfold_demo",
+                file=form.cleaned_data["import_file"],
+                created_by=request.user,
+            )
+            run_import.delay_on_commit(job.pk)
+            self.message_user(request, _("The import has been queued."))
+            return redirect("admin:shared_importjob_change", job.pk)
+        context = {
+            **self.admin_site.each_context(request),
+            "form": form,
+            "opts": self.model._meta,  # noqa: SLF001
+            "title": _("Background import"),
+        }
+        return TemplateResponse(request, "admin/shared/background_import.html", context)
+
 
 @admin.register(Car)
-class CarAdmin(ModelAdmin):
+class CarAdmin(BulkAuditMixin, ModelAdmin):
     """
     Basic Unfold admin interface for the Car model.
 
@@ -205,7 +232,7 @@ class CarAdmin(ModelAdmin):
 
 
 @admin.register(DemoCategory)
-class DemoCategoryAdmin(ModelAdmin):
+class DemoCategoryAdmin(BulkAuditMixin, ModelAdmin):
     """
     Basic Unfold admin interface for the DemoCategory model.
 
@@ -216,3 +243,37 @@ class DemoCategoryAdmin(ModelAdmin):
     list_display = ("name", "description")
     search_fields = ("name",)
     compressed_fields = True  # Collapses form sections for concise layout.
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(ModelAdmin):
+    """
+    Read-only progress view of background imports.
+
+    Jobs are created from the "Background import" button of the importing
+    model's changelist and updated by the worker after every chunk.
+    """
+
+    list_display = (
+        "__str__",
+        "status",
+        "progress_display",
+        "new_rows",
+        "updated_rows",
+        "skipped_rows",
+        "error_rows",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "resource")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description=_("Progress"))
+    def progress_display(self, obj):
+        return f"{obj.progress}%"
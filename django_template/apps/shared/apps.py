@@ -1,6 +1,15 @@
+import contextlib
+
 from django.apps import AppConfig
 
 
 class SharedConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "django_template.apps.shared"
+
+    def ready(self):
+        from .audit import install_audit_receivers  # noqa: PLC0415
+
+        install_audit_receivers()
+        with contextlib.suppress(ImportError):
+            import django_template.apps.shared.signals  # noqa: F401, PLC0415
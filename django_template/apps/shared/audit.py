@@ -0,0 +1,487 @@
+"""Buffered, batched auditlog writes.
+
+With ``AUDITLOG_ASYNC`` enabled, saving or deleting a registered model no longer
+inserts a ``LogEntry`` inside the request transaction. The entry is still built
+synchronously (diff, object repr, actor, correlation id and timestamp are all
+captured at change time), but it is only queued once the surrounding transaction
+commits, so rolled back changes (including rolled back savepoints) are never
+logged.
+
+Queued entries are kept per thread and handed to the
+``write_audit_entries`` Celery task in batches of ``AUDITLOG_BATCH_SIZE``, at
+the end of every request and Celery task, and when the process exits. If the
+broker can't be reached, the batch is written inline instead, so entries are
+never dropped. Each batch carries a unique id that is recorded as an
+``AuditBatch`` row in the transaction that inserts it, so a batch delivered
+twice (the task acks late and retries) is only written once.
+
+auditlog's own save and delete receivers stay connected; a ``pre_log`` receiver
+stops them from writing the entries handled here. ``post_log`` is sent once the
+change commits and its (not yet saved) entry is queued. Updates cost one more
+primary key lookup than with auditlog alone, as auditlog loads the old row
+before ``pre_log`` is sent.
+
+Entries of one object keep their order: a batch is inserted in the order its
+changes were committed, and each entry keeps the timestamp of its change, which
+is what the log is ordered by.
+
+M2M changes and access logs are still written synchronously by auditlog.
+
+Inside ``bulk_audit(model, size)``, changes to ``model`` are not logged per
+row. When ``size`` reaches ``AUDITLOG_BULK_THRESHOLD``, the operation is
+logged as one changeset entry per action instead: the affected ids go in
+``additional_data`` and ``changes`` holds the distinct old and new values of
+each changed field. Changeset entries are not linked to a single object, so
+they don't show up in per-object history.
+
+Entries older than ``AUDITLOG_RETENTION_DAYS`` are archived by the
+``archive_audit_log`` beat task: month by month, in batches, they are exported
+to gzipped JSON Lines files under ``auditlog/<YYYY-MM>/`` in the default
+storage and deleted from the table.
+"""
+
+import atexit
+import contextlib
+import gzip
+import io
+import json
+import logging
+import threading
+import uuid
+from collections import defaultdict
+from contextvars import ContextVar
+from datetime import datetime
+from datetime import timedelta
+
+from auditlog import get_logentry_model
+from auditlog.cid import get_cid
+from auditlog.diff import model_instance_diff
+from auditlog.models import LogEntryManager
+from auditlog.receivers import check_disable
+from auditlog.registry import AuditlogModelRegistry
+from auditlog.registry import auditlog
+from auditlog.signals import post_log
+from auditlog.signals import pre_log
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import router
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_save
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from kombu.exceptions import OperationalError
+
+from .models.audit.models import AuditBatch
+from .routers import use_primary
+
+logger = logging.getLogger(__name__)
+
+# Distinct old and new values kept per field in a bulk changeset entry.
+BULK_DELTA_VALUES = 20
+# How long written batch ids are kept to recognize redelivered batches.
+AUDIT_BATCH_RETENTION = timedelta(days=7)
+
+_local = threading.local()
+# Set while the receivers below send pre_log, so defer_audit_log lets them log.
+_recording: ContextVar[bool] = ContextVar("audit_recording", default=False)
+
+
+class _EntryBuilder(LogEntryManager):
+    """Fills in a ``LogEntry`` like auditlog does, without saving it."""
+
+    def create(self, **kwargs):
+        entry = self.model(**kwargs)
+        # AuditlogMiddleware attaches the actor and remote address from a
+        # LogEntry pre_save receiver; bulk_create never sends pre_save, so send
+        # it now while the request context is still active.
+        pre_save.send(
+            sender=self.model,
+            instance=entry,
+            raw=False,
+            using=router.db_for_write(self.model),
+            update_fields=None,
+        )
+        return entry
+
+
+_builder = _EntryBuilder()
+
+
+def pending_audit_entries() -> list:
+    """Return the committed entries of this thread awaiting a flush."""
+    if not hasattr(_local, "entries"):
+        _local.entries = []
+    return _local.entries
+
+
+def buffer_audit_entry(entry) -> None:
+    pending = pending_audit_entries()
+    pending.append(entry)
+    if len(pending) >= settings.AUDITLOG_BATCH_SIZE:
+        flush_audit_entries()
+
+
+def flush_audit_entries() -> int:
+    """
+    Hand this thread's pending entries to Celery and return how many there were.
+
+    Falls back to inserting them inline when the broker is unavailable.
+    """
+    from .tasks import write_audit_entries  # noqa: PLC0415
+
+    entries = pending_audit_entries()
+    if not entries:
+        return 0
+    _local.entries = []
+    payload = serialize_audit_entries(entries)
+    try:
+        write_audit_entries.apply_async((payload,), retry=False)
+    except OperationalError:
+        logger.warning(
+            "Celery broker unavailable, writing %d audit entries inline.",
+            len(entries),
+        )
+        save_audit_entries(payload)
+    return len(entries)
+
+
+def serialize_audit_entries(entries: list) -> str:
+    """Serialize ``entries`` as one batch with a unique id."""
+    rows = []
+    for entry in entries:
+        row = {
+            field.attname: getattr(entry, field.attname)
+            for field in entry._meta.concrete_fields  # noqa: SLF001
+            if not field.primary_key
+        }
+        # DjangoJSONEncoder drops microseconds, which order same-object changes.
+        row["timestamp"] = entry.timestamp.isoformat()
+        rows.append(row)
+    batch = {"id": str(uuid.uuid4()), "entries": rows}
+    return json.dumps(batch, cls=DjangoJSONEncoder)
+
+
+def save_audit_entries(payload: str) -> int:
+    """
+    Insert a serialized batch of entries and return how many were written.
+
+    A batch that was already written is skipped and counts as zero.
+    """
+    batch = json.loads(payload)
+    log_entry_model = get_logentry_model()
+    entries = []
+    for row in batch["entries"]:
+        row["timestamp"] = parse_datetime(row["timestamp"])
+        entries.append(log_entry_model(**row))
+    with transaction.atomic():
+        _batch, created = AuditBatch.objects.get_or_create(id=batch["id"])
+        if not created:
+            return 0
+        log_entry_model.objects.bulk_create(entries)
+    return len(entries)
+
+
+def prune_audit_batches(now: datetime | None = None) -> int:
+    """Forget the ids of batches written more than ``AUDIT_BATCH_RETENTION`` ago."""
+    cutoff = (now or timezone.now()) - AUDIT_BATCH_RETENTION
+    deleted, _rows = AuditBatch.objects.filter(written_at__lt=cutoff).delete()
+    return deleted
+
+
+class BulkChangeset:
+    """The row changes of one bulk operation on ``model``."""
+
+    def __init__(self, model: type[Model]) -> None:
+        self.model = model
+        self.object_ids: dict[int, list] = defaultdict(list)
+        self.deltas: dict[int, dict] = defaultdict(dict)
+        self.rows_changed: dict[int, dict] = defaultdict(lambda: defaultdict(int))
+
+    def add(self, action: int, pk, changes: dict | None = None) -> None:
+        self.object_ids[action].append(pk)
+        for field_name, (old, new) in (changes or {}).items():
+            olds, news = self.deltas[action].setdefault(field_name, ([], []))
+            if len(olds) < BULK_DELTA_VALUES and old not in olds:
+                olds.append(old)
+            if len(news) < BULK_DELTA_VALUES and new not in news:
+                news.append(new)
+            self.rows_changed[action][field_name] += 1
+
+    def entries(self) -> list:
+        """Build one unsaved ``LogEntry`` per action in the changeset."""
+        content_type = ContentType.objects.get_for_model(self.model)
+        plural = self.model._meta.verbose_name_plural  # noqa: SLF001
+        return [
+            _builder.create(
+                content_type=content_type,
+                object_pk="",
+                object_repr=f"{len(ids)} {plural}",
+                action=action,
+                changes=self.deltas[action] or None,
+                additional_data={
+                    "bulk": True,
+                    "object_ids": ids,
+                    "rows_changed": self.rows_changed[action],
+                },
+                cid=get_cid(),
+            )
+            for action, ids in self.object_ids.items()
+        ]
+
+
+_bulk: ContextVar[BulkChangeset | None] = ContextVar("bulk_audit", default=None)
+
+
+@contextlib.contextmanager
+def bulk_audit(model: type[Model], size: int):
+    """
+    Log the changes to ``model`` made inside the block as one changeset.
+
+    ``size`` is the number of rows the operation affects; below
+    ``AUDITLOG_BULK_THRESHOLD`` rows are logged one by one as usual.
+    """
+    if size < settings.AUDITLOG_BULK_THRESHOLD or _bulk.get() is not None:
+        yield
+        return
+    changeset = BulkChangeset(model)
+    token = _bulk.set(changeset)
+    try:
+        yield
+    finally:
+        _bulk.reset(token)
+    log_bulk_changeset(changeset)
+
+
+def log_bulk_changeset(changeset: BulkChangeset) -> None:
+    """Log ``changeset``, e.g. one collected by hand around ``bulk_create()``."""
+    using = router.db_for_write(changeset.model)
+    for entry in changeset.entries():
+        _log(entry, using)
+
+
+def log_change(action: int, instance: Model, changes: dict | None) -> None:
+    """Log one row change made without model signals, e.g. by ``bulk_update()``."""
+    if changes:
+        entry = _builder.log_create(instance, action=action, changes=changes)
+        _log(entry, router.db_for_write(type(instance), instance=instance))
+
+
+def _bulk_changeset(sender: type[Model]) -> BulkChangeset | None:
+    changeset = _bulk.get()
+    return changeset if changeset is not None and changeset.model is sender else None
+
+
+def _log(entry, using: str) -> None:
+    if settings.AUDITLOG_ASYNC:
+        transaction.on_commit(lambda: buffer_audit_entry(entry), using=using)
+    else:
+        entry.save(using=using)
+
+
+def diff_instances(
+    diff_old: Model | None, diff_new: Model | None, fields_to_check=None
+) -> dict | None:
+    """Return the changes between two versions of a row, as auditlog logs them."""
+    return model_instance_diff(
+        diff_old,
+        diff_new,
+        fields_to_check=fields_to_check,
+        use_json_for_changes=getattr(settings, "AUDITLOG_STORE_JSON_CHANGES", False),
+    )
+
+
+def _defers(sender: type[Model]) -> bool:
+    """Whether changes to ``sender`` are logged here rather than by auditlog."""
+    return settings.AUDITLOG_ASYNC or _bulk_changeset(sender) is not None
+
+
+def _load_old(sender: type[Model], pk) -> Model | None:
+    """Load the stored version of a row like auditlog does before an update."""
+    manager = (
+        sender._base_manager  # noqa: SLF001
+        if getattr(settings, "AUDITLOG_USE_BASE_MANAGER", False)
+        else sender._default_manager  # noqa: SLF001
+    )
+    return manager.filter(pk=pk).first()
+
+
+def _record(  # noqa: PLR0913
+    action: int,
+    instance: Model,
+    sender: type[Model],
+    diff_old: Model | None,
+    diff_new: Model | None,
+    fields_to_check=None,
+) -> None:
+    """Build the entry for one change and queue it once the change commits."""
+    token = _recording.set(True)
+    try:
+        pre_log_results = pre_log.send(sender, instance=instance, action=action)
+    finally:
+        _recording.reset(token)
+    if any(result is False for _receiver, result in pre_log_results):
+        return
+    changes = diff_instances(diff_old, diff_new, fields_to_check)
+    if not changes:
+        return
+    entry = _builder.log_create(instance, action=action, changes=changes)
+
+    def queue():
+        buffer_audit_entry(entry)
+        post_log.send(
+            sender,
+            instance=instance,
+            instance_old=diff_old,
+            action=action,
+            error=None,
+            pre_log_results=pre_log_results,
+            changes=changes,
+            log_entry=entry,
+            log_created=True,
+            use_json_for_changes=getattr(
+                settings, "AUDITLOG_STORE_JSON_CHANGES", False
+            ),
+        )
+
+    transaction.on_commit(queue, using=router.db_for_write(sender, instance=instance))
+
+
+def defer_audit_log(sender, instance, action, **kwargs):
+    """``pre_log`` receiver: skip auditlog's entry for changes logged here."""
+    actions = _builder.model.Action
+    if _recording.get() or action not in (
+        actions.CREATE,
+        actions.UPDATE,
+        actions.DELETE,
+    ):
+        return None
+    return False if _defers(sender) else None
+
+
+@check_disable
+def log_create(sender, instance, created, **kwargs):
+    changeset = _bulk_changeset(sender)
+    if changeset is not None:
+        if created:
+            changeset.add(_builder.model.Action.CREATE, instance.pk)
+    elif settings.AUDITLOG_ASYNC and created:
+        _record(_builder.model.Action.CREATE, instance, sender, None, instance)
+
+
+@check_disable
+def log_update(sender, instance, **kwargs):
+    if not _defers(sender):
+        return
+    if instance._state.adding or instance.pk is None:  # noqa: SLF001
+        return
+    old = _load_old(sender, instance.pk)
+    update_fields = kwargs.get("update_fields")
+    changeset = _bulk_changeset(sender)
+    if changeset is not None:
+        changes = diff_instances(old, instance, update_fields)
+        if changes:
+            changeset.add(_builder.model.Action.UPDATE, instance.pk, changes)
+    else:
+        _record(
+            _builder.model.Action.UPDATE,
+            instance,
+            sender,
+            old,
+            instance,
+            fields_to_check=update_fields,
+        )
+
+
+@check_disable
+def log_delete(sender, instance, **kwargs):
+    changeset = _bulk_changeset(sender)
+    if instance.pk is None:
+        return
+    if changeset is not None:
+        changeset.add(_builder.model.Action.DELETE, instance.pk)
+    elif settings.AUDITLOG_ASYNC:
+        _record(_builder.model.Action.DELETE, instance, sender, instance, None)
+
+
+def install_audit_receivers(registry: AuditlogModelRegistry = auditlog) -> None:
+    """
+    Connect the receivers above for every model registered with ``registry``.
+
+    auditlog's receivers stay connected and keep logging whatever the
+    receivers above don't, so ``AUDITLOG_ASYNC`` can be toggled at runtime.
+    """
+    _builder.model = get_logentry_model()
+    pre_log.connect(defer_audit_log, dispatch_uid="shared.audit.defer_audit_log")
+    for model in registry.get_models():
+        label = model._meta.label  # noqa: SLF001
+        for signal, receiver in (
+            (post_save, log_create),
+            (pre_save, log_update),
+            (post_delete, log_delete),
+        ):
+            signal.connect(
+                receiver,
+                sender=model,
+                dispatch_uid=f"shared.audit.{receiver.__name__}.{label}",
+            )
+    atexit.unregister(flush_audit_entries)
+    atexit.register(flush_audit_entries)
+
+
+def audit_retention_cutoff(now: datetime | None = None) -> datetime:
+    """Return the start of the oldest month whose entries are kept."""
+    keep_from = (now or timezone.now()) - timedelta(
+        days=settings.AUDITLOG_RETENTION_DAYS
+    )
+    return _month_start(keep_from)
+
+
+def archive_audit_entries(before: datetime, limit: int) -> int:
+    """
+    Archive up to ``limit`` of the oldest entries logged before ``before``.
+
+    A batch never spans two months. Returns the number of entries archived;
+    zero means there is nothing left to archive.
+    """
+    log_entry_model = get_logentry_model()
+    # Read from the primary: whatever is exported is deleted there.
+    with use_primary():
+        oldest = (
+            log_entry_model.objects.filter(timestamp__lt=before)
+            .order_by("timestamp")
+            .values_list("timestamp", flat=True)
+            .first()
+        )
+        if oldest is None:
+            return 0
+        month = _month_start(oldest)
+        next_month = _month_start(month + timedelta(days=32))
+        in_month = log_entry_model.objects.filter(
+            timestamp__gte=month,
+            timestamp__lt=min(next_month, before),
+        )
+        rows = list(in_month.order_by("id").values()[:limit])
+
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb") as archive:
+            for row in rows:
+                row["timestamp"] = row["timestamp"].isoformat()
+                archive.write(json.dumps(row, cls=DjangoJSONEncoder).encode())
+                archive.write(b"\n")
+        first_id, last_id = rows[0]["id"], rows[-1]["id"]
+        default_storage.save(
+            f"auditlog/{month:%Y-%m}/{first_id}-{last_id}.jsonl.gz",
+            ContentFile(buffer.getvalue()),
+        )
+        in_month.filter(id__lte=last_id).delete()
+    return len(rows)
+
+
+def _month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
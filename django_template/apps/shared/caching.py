@@ -0,0 +1,62 @@
+"""Per-model data versions used to invalidate derived caches.
+
+Every cached artefact derived from a model's table (counts, rendered
+fragments, API payloads) embeds the model's current data version in its cache
+key. Bumping the version on write makes all of them stale at once without
+having to know or delete the individual keys. Writes bump it once their
+transaction commits: bumped any earlier, a concurrent reader could cache the
+pre-commit data under the new version.
+
+Passing ``pk`` scopes a version to a single row, for artefacts that only
+depend on one object (such as a user's own profile payload). Unlike model
+versions, which are few and kept until evicted, row versions expire after
+``DATA_VERSION_ROW_TIMEOUT`` so rows that stop being read don't keep a key
+forever; an expired version restarts at the current time, which only makes
+the artefacts keyed on it miss.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+
+
+def data_version_key(model: type[Model], pk: object = None) -> str:
+    key = f"data-version:{model._meta.label_lower}"  # noqa: SLF001
+    return key if pk is None else f"{key}:{pk}"
+
+
+def _version_timeout(pk: object) -> int | None:
+    return None if pk is None else settings.DATA_VERSION_ROW_TIMEOUT
+
+
+def get_data_version(model: type[Model], pk: object = None) -> int:
+    """
+    Return the current data version of ``model``.
+
+    Versions are nanosecond timestamps of the last recorded write, so they also
+    serve as a cheap last-modified marker. A missing version (cold or evicted
+    cache) is initialised to the current time.
+    """
+    key = data_version_key(model, pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=_version_timeout(pk))
+        version = cache.get(key, time.time_ns())
+    return version
+
+
+def bump_data_version(model: type[Model], pk: object = None) -> int:
+    """Record a write to ``model`` (or one of its rows) and return the version."""
+    version = time.time_ns()
+    cache.set(data_version_key(model, pk), version, timeout=_version_timeout(pk))
+    return version
+
+
+def bump_data_version_on_commit(
+    model: type[Model], pk: object = None, using: str | None = None
+) -> None:
+    """Bump the data version once the current transaction on ``using`` commits."""
+    transaction.on_commit(lambda: bump_data_version(model, pk), using=using)
@@ -0,0 +1,71 @@
+"""Cached and approximate row counts for large querysets.
+
+``COUNT(*)`` on PostgreSQL is a full scan of the matching rows. This module
+caches counts per distinct query (i.e. per filter combination) and keys them by
+the model's data version, so any write to the table invalidates them. For
+tables larger than ``COUNT_ESTIMATE_THRESHOLD`` rows the planner's estimate is
+used instead of an exact count.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import QuerySet
+
+from .caching import get_data_version
+
+
+def count_cache_key(queryset: QuerySet) -> str:
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.blake2b(
+        f"{queryset.db}:{sql}:{params!r}".encode(), digest_size=16
+    ).hexdigest()
+    version = get_data_version(queryset.model)
+    return f"count:{queryset.model._meta.label_lower}:{version}:{digest}"  # noqa: SLF001
+
+
+def cached_count(queryset: QuerySet) -> int:
+    """Return the number of rows in ``queryset``, served from cache if possible."""
+    key = count_cache_key(queryset)
+    count = cache.get(key)
+    if count is None:
+        count = approximate_count(queryset)
+        cache.set(key, count, timeout=settings.COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def approximate_count(queryset: QuerySet) -> int:
+    """
+    Count ``queryset`` exactly on small tables and estimate it on large ones.
+
+    Estimates come from PostgreSQL's statistics: ``pg_class.reltuples`` decides
+    whether the table is large, and the query plan's row estimate is used as
+    the count. Other database backends always count exactly.
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset.count()
+    table = queryset.model._meta.db_table  # noqa: SLF001
+    if table_row_estimate(table, using=queryset.db) < settings.COUNT_ESTIMATE_THRESHOLD:
+        return queryset.count()
+    return planner_row_estimate(queryset)
+
+
+def table_row_estimate(table: str, using: str = "default") -> int:
+    """Return PostgreSQL's estimated number of rows in ``table``."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [table],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 for tables that have never been vacuumed or analysed.
+    return max(int(row[0]), 0) if row else 0
+
+
+def planner_row_estimate(queryset: QuerySet) -> int:
+    """Return the planner's estimated row count for ``queryset``."""
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,343 @@
+"""Faceted filtering over the car catalog.
+
+A facet is a dimension the catalog can be filtered on (make, model, colour,
+transmission, year range and price band). Facet counts are read from
+``CarFacetCount``, a summary of the available cars grouped by every facet at
+once, so any combination of facet filters can be answered from it. Given the
+current selection, all counts come from a single ``UNION ALL`` query over the
+summary: each branch sums its rows by one facet while applying every *other*
+facet's filter, so the counts show how many cars each option would add to the
+current results.
+
+The summary is rebuilt by Celery ``CAR_FACET_REFRESH_DELAY`` seconds after cars
+change, however many changes arrive in between, and periodically from beat for
+writes that bypass model signals. Counts are cached per selection under the
+summary's data version, so car writes don't invalidate them until the rebuilt
+summary lands.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from dataclasses import field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import CharField
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import Q
+from django.db.models import QuerySet
+from django.db.models import Sum
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Cast
+from django.http import QueryDict
+from django.utils.functional import Promise
+from django.utils.translation import gettext_lazy as _
+from kombu.exceptions import OperationalError
+
+from .caching import bump_data_version
+from .caching import get_data_version
+from .models.cars.models import Car
+from .models.cars.models import CarFacetCount
+from .routers import use_primary
+from .services import list_available_cars
+
+logger = logging.getLogger(__name__)
+
+# Set while a summary rebuild is scheduled, so a burst of writes queues only one.
+REFRESH_PENDING_KEY = "facets:refresh-pending"
+
+# Year bounds outside this range are ignored rather than sent to the database.
+MIN_YEAR = 1900
+MAX_YEAR = 2100
+
+# (key, label, lower bound inclusive, upper bound exclusive)
+PRICE_BANDS = (
+    ("under-50", _("Under £50"), None, 50),
+    ("50-100", _("£50 to £100"), 50, 100),
+    ("100-150", _("£100 to £150"), 100, 150),
+    ("150-plus", _("£150 and over"), 150, None),
+)
+
+
+@dataclass
+class FacetOption:
+    value: str
+    label: str
+    count: int
+    selected: bool
+
+
+@dataclass
+class FacetGroup:
+    name: str
+    label: str | Promise
+    widget: str
+    selected: tuple[str, ...]
+    options: list[FacetOption] = field(default_factory=list)
+
+
+class ChoiceFacet:
+    """A facet whose options are the distinct values of a model field."""
+
+    widget = "checkbox"
+    # Whether the facet's value is computed from car columns rather than stored.
+    computed = False
+
+    def __init__(
+        self, name: str, label: str | Promise, choices: dict | None = None
+    ) -> None:
+        self.name = name
+        self.label = label
+        self.choices = choices or {}
+
+    def parse(self, query: QueryDict) -> tuple[str, ...]:
+        return tuple(sorted({value for value in query.getlist(self.name) if value}))
+
+    def expression(self):
+        return F(self.name)
+
+    def filter(self, selected: tuple[str, ...]) -> Q:
+        return Q(**{f"{self.name}__in": selected}) if selected else Q()
+
+    def summary_filter(self, selected: tuple[str, ...]) -> Q:
+        """Like :meth:`filter`, for ``CarFacetCount`` rows instead of cars."""
+        return self.filter(selected)
+
+    def option_label(self, value: str) -> str:
+        return self.choices.get(value, value)
+
+    def sort_key(self, value: str):
+        return value
+
+
+class PriceBandFacet(ChoiceFacet):
+    """Buckets ``price_per_day`` into the fixed ``PRICE_BANDS``."""
+
+    computed = True
+
+    def __init__(self, name: str, label: str | Promise) -> None:
+        super().__init__(name, label, {key: band for key, band, *_rest in PRICE_BANDS})
+        self._order = [key for key, *_rest in PRICE_BANDS]
+
+    def parse(self, query: QueryDict) -> tuple[str, ...]:
+        return tuple(value for value in super().parse(query) if value in self.choices)
+
+    def expression(self):
+        return Case(
+            *(
+                When(self._band_q(low, high), then=Value(key))
+                for key, _label, low, high in PRICE_BANDS
+            ),
+            output_field=CharField(),
+        )
+
+    def filter(self, selected: tuple[str, ...]) -> Q:
+        q = Q()
+        for key, _label, low, high in PRICE_BANDS:
+            if key in selected:
+                q |= self._band_q(low, high)
+        return q
+
+    def summary_filter(self, selected: tuple[str, ...]) -> Q:
+        # The summary stores the band key itself.
+        return Q(**{f"{self.name}__in": selected}) if selected else Q()
+
+    def sort_key(self, value: str):
+        return self._order.index(value)
+
+    @staticmethod
+    def _band_q(low: int | None, high: int | None) -> Q:
+        q = Q()
+        if low is not None:
+            q &= Q(price_per_day__gte=low)
+        if high is not None:
+            q &= Q(price_per_day__lt=high)
+        return q
+
+
+class YearRangeFacet(ChoiceFacet):
+    """Filters on an inclusive ``year_min``/``year_max`` range."""
+
+    widget = "range"
+
+    def parse(self, query: QueryDict) -> tuple[str, ...]:
+        bounds = []
+        for suffix in ("min", "max"):
+            try:
+                year = int(query.get(f"{self.name}_{suffix}", ""))
+            except ValueError:
+                year = None
+            valid = year is not None and MIN_YEAR <= year <= MAX_YEAR
+            bounds.append(str(year) if valid else "")
+        return tuple(bounds) if any(bounds) else ()
+
+    def filter(self, selected: tuple[str, ...]) -> Q:
+        if not selected:
+            return Q()
+        low, high = selected
+        q = Q()
+        if low:
+            q &= Q(**{f"{self.name}__gte": int(low)})
+        if high:
+            q &= Q(**{f"{self.name}__lte": int(high)})
+        return q
+
+    def sort_key(self, value: str):
+        return int(value)
+
+
+FACETS = (
+    ChoiceFacet("make", _("Make")),
+    ChoiceFacet("model", _("Model")),
+    YearRangeFacet("year", _("Year")),
+    ChoiceFacet("color", _("Colour")),
+    PriceBandFacet("price_band", _("Price per day")),
+    ChoiceFacet("transmission", _("Transmission"), dict(Car.TRANSMISSION_CHOICES)),
+)
+
+
+class FacetSelection:
+    """The facet values selected in a request's query string."""
+
+    def __init__(self, selected: dict[str, tuple[str, ...]]) -> None:
+        self.selected = {name: values for name, values in selected.items() if values}
+
+    @classmethod
+    def from_query(cls, query: QueryDict) -> "FacetSelection":
+        return cls({facet.name: facet.parse(query) for facet in FACETS})
+
+    def get(self, name: str) -> tuple[str, ...]:
+        return self.selected.get(name, ())
+
+    def filter(self, exclude: str | None = None, *, summary: bool = False) -> Q:
+        """
+        Combine the filters of all selected facets except ``exclude``.
+
+        With ``summary``, the filter applies to ``CarFacetCount`` instead of cars.
+        """
+        q = Q()
+        for facet in FACETS:
+            if facet.name != exclude:
+                selected = self.get(facet.name)
+                q &= (
+                    facet.summary_filter(selected)
+                    if summary
+                    else facet.filter(selected)
+                )
+        return q
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        return queryset.filter(self.filter())
+
+    def cache_token(self) -> str:
+        return hashlib.blake2b(
+            repr(sorted(self.selected.items())).encode(), digest_size=16
+        ).hexdigest()
+
+
+def facet_counts_queryset(selection: FacetSelection) -> QuerySet:
+    """Build the single ``UNION ALL`` query yielding ``(facet, value, count)``."""
+    branches = [
+        CarFacetCount.objects.filter(selection.filter(exclude=facet.name, summary=True))
+        .annotate(
+            facet=Value(facet.name, output_field=CharField()),
+            value=Cast(facet.name, output_field=CharField()),
+        )
+        .values("facet", "value")
+        .annotate(count=Sum("cars"))
+        .order_by()
+        for facet in FACETS
+    ]
+    return branches[0].union(*branches[1:], all=True)  # type: ignore[arg-type]
+
+
+def refresh_facet_summary() -> int:
+    """Rebuild ``CarFacetCount`` from the available cars; return its row count."""
+    rows = (
+        list_available_cars()
+        .annotate(
+            **{facet.name: facet.expression() for facet in FACETS if facet.computed},
+        )
+        .values(*(facet.name for facet in FACETS))
+        .annotate(cars=Count("pk"))
+        .order_by()
+    )
+    compiler = rows.query.get_compiler(connection=connection)
+    sql, params = compiler.as_sql()
+    # Every selected column is aliased to its summary field name.
+    columns = [alias for _expression, _sql, alias in compiler.select]
+    quote = connection.ops.quote_name
+    table = quote(CarFacetCount._meta.db_table)  # noqa: SLF001
+    with use_primary(), transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Serialise rebuilds without blocking readers: two concurrent ones
+            # would each miss the other's rows when deleting and double them.
+            cursor.execute(f"LOCK TABLE {table} IN EXCLUSIVE MODE")
+        CarFacetCount.objects.all().delete()
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(map(quote, columns))}) {sql}",
+            params,
+        )
+        created = cursor.rowcount
+    bump_data_version(CarFacetCount)
+    return created
+
+
+def schedule_facet_refresh() -> None:
+    """Queue a summary rebuild unless one is already due."""
+    from .tasks import refresh_car_facets  # noqa: PLC0415
+
+    delay = settings.CAR_FACET_REFRESH_DELAY
+    if not cache.add(REFRESH_PENDING_KEY, value=True, timeout=delay):
+        return
+    try:
+        refresh_car_facets.apply_async(countdown=delay, retry=False)
+    except OperationalError:
+        # Keep the pending key so the writes of the next ``delay`` seconds don't
+        # each wait on the broker again; the periodic rebuild from beat catches up.
+        logger.warning("Celery broker unavailable, car facet refresh not queued.")
+
+
+def facet_counts(selection: FacetSelection) -> list[FacetGroup]:
+    """Return every facet with its options and counts for ``selection``."""
+    key = f"facets:{get_data_version(CarFacetCount)}:{selection.cache_token()}"
+    counts = cache.get(key)
+    if counts is None:
+        counts = {facet.name: {} for facet in FACETS}
+        for row in facet_counts_queryset(selection):
+            if row["value"] is not None:
+                counts[row["facet"]][row["value"]] = row["count"]
+        cache.set(key, counts, timeout=settings.COUNT_CACHE_TIMEOUT)
+
+    groups = []
+    for facet in FACETS:
+        selected = selection.get(facet.name)
+        values = dict(counts[facet.name])
+        if facet.widget == "checkbox":
+            # Keep selected options visible so they can be cleared even when
+            # the other filters leave no matching cars.
+            for value in selected:
+                values.setdefault(value, 0)
+        group = FacetGroup(
+            name=facet.name,
+            label=facet.label,
+            widget=facet.widget,
+            selected=selected,
+        )
+        for value in sorted(values, key=facet.sort_key):
+            group.options.append(
+                FacetOption(
+                    value=value,
+                    label=facet.option_label(value),
+                    count=values[value],
+                    selected=value in selected,
+                ),
+            )
+        groups.append(group)
+    return groups
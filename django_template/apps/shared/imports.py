@@ -0,0 +1,106 @@
+"""Background, chunked imports through django-import-export resources.
+
+The admin's interactive import parses the whole file and imports it row by row
+inside one web request. A background import instead stores the uploaded CSV
+file, records an :class:`ImportJob` and hands it to the ``run_import`` Celery
+task, which streams the file in chunks of ``IMPORT_CHUNK_SIZE`` rows. Each
+chunk is imported in its own transaction by a bulk resource, and the job's
+counters are saved after every chunk so the admin can show progress.
+
+A chunk whose rows raise unexpected errors is rolled back as a whole and
+counted as failed; rows failing validation are skipped and reported.
+
+Resources are imported lazily by dotted path, so this module loads without
+django-import-export in ``INSTALLED_APPS`` (the slim app profile).
+"""
+
+import csv
+import io
+from collections.abc import Iterator
+from typing import IO
+
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from tablib import Dataset
+
+from .models.imports.models import ImportJob
+
+IMPORT_RESOURCES = {
+    "unfold_demo": "django_template.apps.shared.resources.UnfoldDemoBulkResource",
+}
+IMPORT_CHUNK_SIZE = 2_000
+# Row errors stored on a job; the counters keep counting past it.
+MAX_REPORTED_ERRORS = 100
+
+
+def csv_chunks(file: IO[bytes], size: int) -> Iterator[Dataset]:
+    """Yield the rows of a CSV file as datasets of at most ``size`` rows."""
+    reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    headers = next(reader, None)
+    if headers is None:
+        return
+    rows = []
+    for row in reader:
+        rows.append(row)
+        if len(rows) == size:
+            yield Dataset(*rows, headers=headers)
+            rows = []
+    if rows:
+        yield Dataset(*rows, headers=headers)
+
+
+def count_csv_rows(file: IO[bytes]) -> int:
+    reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    return max(0, sum(1 for _row in reader) - 1)
+
+
+def run_import_job(job: ImportJob, chunk_size: int = IMPORT_CHUNK_SIZE) -> None:
+    """Import ``job``'s file chunk by chunk, saving progress after each one."""
+    resource = import_string(IMPORT_RESOURCES[job.resource])()
+    with job.file.open("rb") as file:
+        job.total_rows = count_csv_rows(file)
+    job.status = ImportJob.Status.RUNNING
+    job.save(update_fields=["status", "total_rows"])
+
+    with job.file.open("rb") as file:
+        for dataset in csv_chunks(file, chunk_size):
+            result = resource.import_data(dataset, use_transactions=True)
+            record_chunk(job, result, len(dataset))
+            job.processed_rows += len(dataset)
+            job.save(
+                update_fields=[
+                    "processed_rows",
+                    "new_rows",
+                    "updated_rows",
+                    "skipped_rows",
+                    "error_rows",
+                    "errors",
+                ],
+            )
+
+    job.status = ImportJob.Status.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "finished_at"])
+
+
+def record_chunk(job: ImportJob, result, size: int) -> None:
+    """Add the outcome of importing one chunk of ``size`` rows to ``job``."""
+    first_row = job.processed_rows + 1
+    if result.has_errors():
+        job.error_rows += size
+        report = [str(error.error) for error in result.base_errors]
+        report += [
+            f"Row {first_row + number - 1}: {errors[0].error}"
+            for number, errors in result.row_errors()
+        ]
+        report.append(f"Rows {first_row}-{first_row + size - 1} were not imported.")
+    else:
+        job.new_rows += result.totals["new"]
+        job.updated_rows += result.totals["update"]
+        job.skipped_rows += result.totals["skip"]
+        job.error_rows += result.totals["invalid"]
+        report = [
+            f"Row {first_row + row.number - 1}: {row.error_dict}"
+            for row in result.invalid_rows
+        ]
+    job.errors.extend(report[: max(0, MAX_REPORTED_ERRORS - len(job.errors))])
@@ -0,0 +1,104 @@
+import time
+from importlib import import_module
+
+from auditlog.middleware import AuditlogMiddleware
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth import HASH_SESSION_KEY
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth import get_user_model
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from django_template.apps.shared.middleware import LazyAuditlogMiddleware
+
+VARIANTS = {
+    "none": None,
+    "auditlog": AuditlogMiddleware,
+    "lazy": LazyAuditlogMiddleware,
+}
+
+
+def build_handler(audit_middleware: type | None):
+    """Chain session, auth and ``audit_middleware`` around a trivial view."""
+
+    def view(request):
+        return HttpResponse()
+
+    handler = view
+    for middleware in (audit_middleware, AuthenticationMiddleware, SessionMiddleware):
+        if middleware is not None:
+            handler = middleware(handler)
+    return handler
+
+
+def time_requests(handler, count: int, cookies: dict) -> tuple[float, float]:
+    """Return the microseconds and queries per ``GET /cars`` through ``handler``."""
+    factory = RequestFactory()
+    factory.cookies.load(cookies)
+    requests = [factory.get("/cars") for _ in range(count)]
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        for request in requests:
+            handler(request)
+        elapsed = time.perf_counter() - started
+    return elapsed / count * 1_000_000, len(queries) / count
+
+
+def login_cookie(user) -> dict:
+    """Return the session cookie of a fresh session logged in as ``user``."""
+    store = import_module(settings.SESSION_ENGINE).SessionStore()
+    store[SESSION_KEY] = str(user.pk)
+    store[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    store[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    store.create()
+    return {settings.SESSION_COOKIE_NAME: store.session_key}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the per-request overhead of the auditlog middleware variants "
+        "on a read-only request that logs nothing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=2_000,
+            help="Requests timed per variant.",
+        )
+        parser.add_argument(
+            "--authenticated",
+            action="store_true",
+            help="Send the requests with the session of the first active user.",
+        )
+
+    def handle(self, *args, **options):
+        count = max(1, options["requests"])
+        cookies = {}
+        if options["authenticated"]:
+            user = get_user_model().objects.filter(is_active=True).first()
+            if user is None:
+                msg = "--authenticated needs at least one active user."
+                raise CommandError(msg)
+            cookies = login_cookie(user)
+
+        results = {}
+        for name, middleware in VARIANTS.items():
+            handler = build_handler(middleware)
+            time_requests(handler, min(count, 100), cookies)  # Warm up.
+            results[name] = time_requests(handler, count, cookies)
+
+        baseline, _ = results["none"]
+        for name, (micros, queries) in results.items():
+            self.stdout.write(
+                f"{name:>8}: {micros:8.1f} us/request "
+                f"(+{micros - baseline:.1f} us), {queries:.2f} queries/request",
+            )
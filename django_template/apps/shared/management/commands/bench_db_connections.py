@@ -0,0 +1,103 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished
+from django.core.signals import request_started
+from django.db import connection
+from django.db import connections
+
+
+def simulated_requests(count: int) -> list[tuple[object, float]]:
+    """
+    Run ``count`` request lifecycles on the current thread.
+
+    Each one fires ``request_started`` and ``request_finished`` around a query,
+    so connections are opened, reused, returned to the pool or closed exactly
+    as they would be by the request handler under the current settings.
+    Returns ``(physical connection id, seconds)`` per request.
+    """
+    results = []
+    try:
+        for _ in range(count):
+            started = time.perf_counter()
+            request_started.send(sender=simulated_requests)
+            try:
+                with connection.cursor() as cursor:
+                    if connection.vendor == "postgresql":
+                        cursor.execute("SELECT pg_backend_pid()")
+                        backend = cursor.fetchone()[0]
+                    else:
+                        cursor.execute("SELECT 1")
+                        # Keep the object alive so its id is never recycled.
+                        backend = connection.connection
+            finally:
+                request_finished.send(sender=simulated_requests)
+            results.append((backend, time.perf_counter() - started))
+    finally:
+        connections.close_all()
+    return results
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulates concurrent requests and reports how many physical database "
+        "connections served them, to compare CONN_MAX_AGE, pooling and "
+        "PgBouncer settings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=1_000,
+            help="Total number of simulated requests.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=16,
+            help="Number of threads issuing requests at the same time.",
+        )
+
+    def handle(self, *args, **options):
+        total = options["requests"]
+        concurrency = max(1, options["concurrency"])
+        shares = [
+            total // concurrency + (1 if i < total % concurrency else 0)
+            for i in range(concurrency)
+        ]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = [
+                result
+                for thread_results in pool.map(simulated_requests, shares)
+                for result in thread_results
+            ]
+        elapsed = time.perf_counter() - started
+
+        database = connection.settings_dict
+        pool_options = database.get("OPTIONS", {}).get("pool") or "off"
+        cursors = "off" if database.get("DISABLE_SERVER_SIDE_CURSORS") else "on"
+        self.stdout.write(
+            f"CONN_MAX_AGE={database['CONN_MAX_AGE']} pool={pool_options} "
+            f"server-side cursors={cursors}",
+        )
+        self.stdout.write(
+            f"{len(results)} requests on {concurrency} threads in {elapsed:.2f}s",
+        )
+        latencies = [seconds * 1000 for _, seconds in results]
+        if len(latencies) > 1:
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            self.stdout.write(
+                f"latency p50 {statistics.median(latencies):.2f} ms, p95 {p95:.2f} ms",
+            )
+        backends = {backend for backend, _ in results}
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(backends)} physical connections served {len(results)} "
+                f"requests ({len(results) / max(1, len(backends)):.1f} per connection)",
+            ),
+        )
@@ -1,29 +1,182 @@
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 
+from auditlog.context import disable_auditlog
 from django.core.management.base import BaseCommand
-from django.utils.crypto import get_random_string
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import connections
 
+from django_template.apps.shared.audit import flush_audit_entries
+from django_template.apps.shared.caching import bump_data_version
+from django_template.apps.shared.facets import refresh_facet_summary
 from django_template.apps.shared.models.cars.models import Car
 
+MAKES = ["Toyota", "Honda", "Ford", "Chevrolet", "Nissan"]
+MODELS = ["Sedan", "SUV", "Hatchback", "Truck", "Coupe"]
+COLORS = ["Red", "Blue", "White", "Black", "Silver"]
+COPY_COLUMNS = (
+    "make",
+    "model",
+    "year",
+    "color",
+    "price_per_day",
+    "transmission",
+    "is_available",
+)
 
-class Command(BaseCommand):
-    help = "Populates the database with 25 sample cars"
-
-    def handle(self, *args, **kwargs):
-        makes = ["Toyota", "Honda", "Ford", "Chevrolet", "Nissan"]
-        models = ["Sedan", "SUV", "Hatchback", "Truck", "Coupe"]
-        colors = ["Red", "Blue", "White", "Black", "Silver"]
-
-        for _ in range(25):
-            car = Car(
-                make=random.choice(makes),
-                model=f"{random.choice(models)} {get_random_string(3, '1234567890').upper()}",
-                year=random.randint(2015, 2024),
-                color=random.choice(colors),
-                price_per_day=round(random.uniform(50, 200), 2),
-                transmission=random.choice(["A", "M"]),
-                is_available=random.choice([True, False]),
+
+def random_car_values(rng: random.Random) -> tuple:
+    """Return one row of car column values, in ``COPY_COLUMNS`` order."""
+    return (
+        rng.choice(MAKES),
+        f"{rng.choice(MODELS)} {rng.randint(0, 999):03d}",
+        rng.randint(2015, 2024),
+        rng.choice(COLORS),
+        f"{rng.uniform(50, 200):.2f}",
+        rng.choice(["A", "M"]),
+        rng.choice([True, False]),
+    )
+
+
+def create_cars(  # noqa: PLR0913
+    count: int,
+    *,
+    batch_size: int,
+    method: str,
+    seed: int | None,
+    worker: int = 0,
+    auditlog: bool = True,
+) -> int:
+    """
+    Insert ``count`` random cars and return the number created.
+
+    ``seed`` and ``worker`` together make the generated rows reproducible;
+    each worker of a multiprocess run draws from its own stream.
+    """
+    rng = random.Random(None if seed is None else f"{seed}:{worker}")  # noqa: S311
+    created = 0
+    while created < count:
+        size = min(batch_size, count - created)
+        rows = [random_car_values(rng) for _ in range(size)]
+        if method == "copy":
+            _copy_rows(rows)
+        elif method == "bulk":
+            Car.objects.bulk_create(
+                [Car(**dict(zip(COPY_COLUMNS, row, strict=True))) for row in rows],
             )
-            car.save()
+        else:
+            for row in rows:
+                car = Car(**dict(zip(COPY_COLUMNS, row, strict=True)))
+                if auditlog:
+                    car.save()
+                else:
+                    with disable_auditlog():
+                        car.save()
+        created += size
+    # Forked workers exit without running atexit hooks.
+    flush_audit_entries()
+    return created
+
+
+def _copy_rows(rows: list[tuple]) -> None:
+    """Stream ``rows`` into the car table with PostgreSQL ``COPY FROM STDIN``."""
+    # Table and column names are constants, never user input.
+    sql = f"COPY {Car._meta.db_table} ({', '.join(COPY_COLUMNS)}) FROM STDIN"  # noqa: SLF001
+    with connection.cursor() as cursor, cursor.copy(sql) as copy:
+        for row in rows:
+            copy.write_row(row)
+
+
+class Command(BaseCommand):
+    help = (
+        "Populates the database with sample cars. Scales from a handful of demo "
+        "rows to multi-million row benchmark datasets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=25,
+            help="Number of cars to create (underscores allowed, e.g. 10_000_000).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5_000,
+            help="Rows inserted per statement for the bulk and copy methods.",
+        )
+        parser.add_argument(
+            "--method",
+            choices=["save", "bulk", "copy"],
+            default="save",
+            help=(
+                "save: one INSERT per car, with auditlog entries; "
+                "bulk: bulk_create; copy: PostgreSQL COPY FROM STDIN. "
+                "bulk and copy never write auditlog entries."
+            ),
+        )
+        parser.add_argument(
+            "--no-auditlog",
+            action="store_false",
+            dest="auditlog",
+            help="Suppress auditlog entries when using the save method.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=None,
+            help="Seed for reproducible datasets.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes inserting in parallel.",
+        )
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        workers = max(1, min(options["workers"], count or 1))
+        if options["batch_size"] < 1:
+            msg = "--batch-size must be at least 1."
+            raise CommandError(msg)
+        if options["method"] == "copy" and connection.vendor != "postgresql":
+            msg = "The copy method requires PostgreSQL."
+            raise CommandError(msg)
+
+        started = time.perf_counter()
+        kwargs = {
+            "batch_size": options["batch_size"],
+            "method": options["method"],
+            "seed": options["seed"],
+            "auditlog": options["auditlog"],
+        }
+        if workers == 1:
+            created = create_cars(count, **kwargs)
+        else:
+            # Forked workers must not share the parent's database connection.
+            connections.close_all()
+            shares = [
+                count // workers + (1 if i < count % workers else 0)
+                for i in range(workers)
+            ]
+            with ProcessPoolExecutor(workers, mp_context=get_context("fork")) as pool:
+                futures = [
+                    pool.submit(create_cars, share, worker=i, **kwargs)
+                    for i, share in enumerate(shares)
+                ]
+                created = sum(future.result() for future in futures)
 
-        self.stdout.write(self.style.SUCCESS("Successfully created 25 sample cars"))
+        # bulk_create and COPY bypass the post_save signal.
+        bump_data_version(Car)
+        refresh_facet_summary()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully created {created} sample cars in {elapsed:.1f}s",
+            ),
+        )
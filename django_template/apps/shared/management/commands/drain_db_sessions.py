@@ -0,0 +1,68 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from django_template.apps.shared.sessions import SessionStore
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves unexpired sessions from the django_session table into the "
+        "session cache and deletes every drained or expired row."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1_000,
+            help="Sessions copied per cache round trip.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many sessions would be moved.",
+        )
+
+    def handle(self, *args, **options):
+        engine = import_module(settings.SESSION_ENGINE)
+        if not issubclass(engine.SessionStore, SessionStore):
+            msg = (
+                f"SESSION_ENGINE is {settings.SESSION_ENGINE!r}; switch it to "
+                "django_template.apps.shared.sessions before draining."
+            )
+            raise CommandError(msg)
+
+        now = timezone.now()
+        live = Session.objects.filter(expire_date__gt=now)
+        if options["dry_run"]:
+            self.stdout.write(f"{live.count()} sessions would be moved.")
+            return
+
+        cache = caches[settings.SESSION_CACHE_ALIAS]
+        store = engine.SessionStore()
+        moved = 0
+        batch_size = options["batch_size"]
+        while batch := list(live.order_by("pk")[:batch_size]):
+            keys = {f"{store.cache_key_prefix}{row.session_key}": row for row in batch}
+            # Sessions already in the cache are newer than their row.
+            present = cache.get_many(keys)
+            for key, row in keys.items():
+                if key not in present:
+                    timeout = (row.expire_date - now).total_seconds()
+                    cache.set(key, store.decode(row.session_data), max(int(timeout), 1))
+                    moved += 1
+            Session.objects.filter(pk__in=[row.pk for row in batch]).delete()
+
+        expired, _ = Session.objects.filter(expire_date__lte=now).delete()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Moved {moved} sessions to the cache and deleted {expired} "
+                "expired sessions.",
+            ),
+        )
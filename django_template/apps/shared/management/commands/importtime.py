@@ -0,0 +1,131 @@
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+# What each kind of process imports before it can do any work.
+TARGETS = {
+    "setup": "import django; django.setup()",
+    "web": (
+        "import django; django.setup(); "
+        "from django.urls import get_resolver; get_resolver().url_patterns"
+    ),
+    "celery": (
+        "import django; django.setup(); "
+        "from config.celery_app import app; app.loader.import_default_modules()"
+    ),
+}
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse the ``-X importtime`` report written to stderr."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():  # noqa: PLR2004
+            continue  # The header line.
+        self_us, cumulative_us, module = fields
+        timings.append(
+            ImportTiming(module.strip(), int(self_us), int(cumulative_us)),
+        )
+    return timings
+
+
+def package_totals(timings: list[ImportTiming]) -> dict[str, int]:
+    """Sum the self time of every module per top-level package."""
+    totals: defaultdict[str, int] = defaultdict(int)
+    for timing in timings:
+        totals[timing.module.partition(".")[0]] += timing.self_us
+    return dict(totals)
+
+
+class Command(BaseCommand):
+    help = (
+        "Profiles the imports a process performs on boot with `python -X "
+        "importtime` and reports the slowest packages and modules."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            choices=sorted(TARGETS),
+            default="web",
+            help="setup: django.setup(); web: plus the URLconf; celery: plus tasks.",
+        )
+        parser.add_argument(
+            "--profile",
+            action="append",
+            choices=["full", "slim"],
+            help="DJANGO_APP_PROFILE to profile; repeat to compare profiles.",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=15,
+            help="Number of packages and modules to list.",
+        )
+
+    def handle(self, *args, **options):
+        profiles = options["profile"] or [settings.APP_PROFILE]
+        for profile in profiles:
+            timings = self.profile(options["target"], profile)
+            self.report(profile, timings, options["top"])
+
+    def profile(self, target: str, profile: str) -> list[ImportTiming]:
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get(
+                "DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE
+            ),
+            "DJANGO_APP_PROFILE": profile,
+        }
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-X", "importtime", "-c", TARGETS[target]],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            errors = [
+                line
+                for line in result.stderr.splitlines()
+                if not line.startswith("import time:")
+            ]
+            msg = f"Booting the {profile} profile failed:\n" + "\n".join(errors[-20:])
+            raise CommandError(msg)
+        return parse_importtime(result.stderr)
+
+    def report(self, profile: str, timings: list[ImportTiming], top: int) -> None:
+        total = sum(timing.self_us for timing in timings)
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"{profile} profile: {total / 1000:.1f} ms importing "
+                f"{len(timings)} modules",
+            ),
+        )
+        self.stdout.write("Packages by self time:")
+        packages = sorted(package_totals(timings).items(), key=lambda item: -item[1])
+        for package, self_us in packages[:top]:
+            share = self_us / total * 100 if total else 0
+            self.stdout.write(f"  {self_us / 1000:9.1f} ms {share:5.1f}%  {package}")
+        self.stdout.write("Modules by cumulative time:")
+        slowest = sorted(timings, key=lambda timing: -timing.cumulative_us)
+        for timing in slowest[:top]:
+            self.stdout.write(
+                f"  {timing.cumulative_us / 1000:9.1f} ms  {timing.module}"
+            )
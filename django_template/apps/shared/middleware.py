@@ -0,0 +1,133 @@
+from contextvars import ContextVar
+from functools import cached_property
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from auditlog.cid import set_cid
+from auditlog.middleware import AuditlogMiddleware
+from django.conf import settings
+
+from .routers import is_pinned
+from .routers import use_primary
+
+REPLICA_PIN_COOKIE = "db_primary"
+
+
+class AuditRequest:
+    """The request a ``LogEntry`` is attributed to, resolved on first use."""
+
+    def __init__(self, middleware: AuditlogMiddleware, request) -> None:
+        self.middleware = middleware
+        self.request = request
+
+    @cached_property
+    def extra_data(self) -> dict:
+        return self.middleware.get_extra_data(self.request)
+
+    def apply(self, entry) -> None:
+        """Fill in the actor and remote address fields ``entry`` leaves empty."""
+        for key, value in self.extra_data.items():
+            if key == "actor":
+                if value is not None and entry.actor_id is None:
+                    entry.actor = value
+                    entry.actor_email = getattr(value, "email", None)
+            elif getattr(entry, key, None) is None:
+                setattr(entry, key, value)
+
+
+current_audit_request: ContextVar[AuditRequest | None] = ContextVar(
+    "current_audit_request",
+    default=None,
+)
+
+
+class ReplicaPinningMiddleware:
+    """
+    Give clients read-your-writes consistency across read replicas.
+
+    Unsafe requests, and requests from clients that wrote within the last
+    ``DATABASE_REPLICA_PIN_SECONDS``, read from the primary. Any request that
+    wrote (re)sets a short-lived cookie so the client's next reads are pinned
+    too, until the replicas have caught up.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        pinned, unsafe = self.pinning(request)
+        with use_primary(pinned=pinned):
+            response = self.get_response(request)
+            # The router pins the context as soon as anything is written.
+            wrote = unsafe or (not pinned and is_pinned())
+        return self.set_pin_cookie(request, response, wrote=wrote)
+
+    async def __acall__(self, request):
+        pinned, unsafe = self.pinning(request)
+        with use_primary(pinned=pinned):
+            response = await self.get_response(request)
+            wrote = unsafe or (not pinned and is_pinned())
+        return self.set_pin_cookie(request, response, wrote=wrote)
+
+    def pinning(self, request) -> tuple[bool, bool]:
+        """Return whether ``request`` reads from the primary, and if it's unsafe."""
+        unsafe = request.method not in ("GET", "HEAD", "OPTIONS", "TRACE")
+        return unsafe or REPLICA_PIN_COOKIE in request.COOKIES, unsafe
+
+    def set_pin_cookie(self, request, response, *, wrote: bool):
+        if wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                secure=request.is_secure(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class LazyAuditlogMiddleware(AuditlogMiddleware):
+    """
+    ``AuditlogMiddleware`` that only does work when an entry is logged.
+
+    The stock middleware resolves the actor on every request, which loads the
+    session and user even for anonymous catalog pages, and connects and
+    disconnects a ``LogEntry`` pre_save receiver per request. This variant
+    only records the request in a context variable; the permanent receiver in
+    ``shared.signals`` resolves the actor and remote address the first time a
+    registered model is written.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        set_cid(request)
+        token = current_audit_request.set(AuditRequest(self, request))
+        try:
+            return self.get_response(request)
+        finally:
+            current_audit_request.reset(token)
+
+    async def __acall__(self, request):
+        set_cid(request)
+        token = current_audit_request.set(AuditRequest(self, request))
+        try:
+            return await self.get_response(request)
+        finally:
+            current_audit_request.reset(token)
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-18 02:41
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, but avoids
+    # locking the car table against writes while the indexes are built.
+    atomic = False
+
+    dependencies = [
+        ('shared', '0003_car'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='car',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['id'], name='car_available_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='car',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['transmission', 'id'], name='car_available_trans_id_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # The admin history views look up one object's entries newest first
+    # (LogEntry.objects.get_for_object() ordered by -timestamp). auditlog only
+    # indexes the columns separately, so add a composite index that serves the
+    # filter and the ordering together. Built concurrently so the log table
+    # stays writable; auditlog_logentry belongs to a third-party app, hence RunSQL.
+    atomic = False
+
+    dependencies = [
+        ('auditlog', '0017_add_actor_email'),
+        ('shared', '0004_car_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS auditlog_object_history_idx '
+                'ON auditlog_logentry (content_type_id, object_id, "timestamp" DESC)'
+            ),
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS auditlog_object_history_idx',
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0006_importjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CarFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('make', models.CharField(max_length=50)),
+                ('model', models.CharField(max_length=50)),
+                ('year', models.IntegerField()),
+                ('color', models.CharField(max_length=30)),
+                ('price_band', models.CharField(max_length=20)),
+                ('transmission', models.CharField(choices=[('A', 'Automatic'), ('M', 'Manual')], max_length=1)),
+                ('cars', models.PositiveIntegerField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:34
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, but avoids
+    # locking the car table against writes while the indexes are built.
+    atomic = False
+
+    dependencies = [
+        ('shared', '0007_carfacetcount'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='car',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['make', 'id'], name='car_available_make_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='car',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['model', 'id'], name='car_available_model_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='car',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['color', 'id'], name='car_available_color_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='car',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['year'], name='car_available_year_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='car',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['price_per_day'], name='car_available_price_idx'),
+        ),
+    ]
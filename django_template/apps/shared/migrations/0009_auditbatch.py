@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0008_car_facet_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditBatch',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('written_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Written at')),
+            ],
+            options={
+                'verbose_name': 'Audit batch',
+                'verbose_name_plural': 'Audit batches',
+            },
+        ),
+    ]
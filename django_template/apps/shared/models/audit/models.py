@@ -0,0 +1,21 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class AuditBatch(models.Model):
+    """
+    A batch of buffered auditlog entries that has been written.
+
+    Inserted in the same transaction as the batch's entries, so a redelivered
+    ``write_audit_entries`` task finds it and doesn't write them twice.
+    """
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    written_at = models.DateTimeField(_("Written at"), auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = _("Audit batch")
+        verbose_name_plural = _("Audit batches")
+
+    def __str__(self):
+        return str(self.id)
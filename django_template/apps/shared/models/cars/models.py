@@ -16,8 +16,73 @@ class Car(models.Model):
     transmission = models.CharField(max_length=1, choices=TRANSMISSION_CHOICES)
     is_available = models.BooleanField(default=True)
 
+    class Meta:
+        # The catalog only ever lists available cars, keyset-paginated by id and
+        # optionally filtered by its facets (see shared.facets). Equality facets
+        # lead an (x, id) index so a filtered page is read in id order; the year
+        # and price ranges are looked up by value.
+        indexes = [
+            models.Index(
+                fields=["id"],
+                name="car_available_id_idx",
+                condition=models.Q(is_available=True),
+            ),
+            models.Index(
+                fields=["transmission", "id"],
+                name="car_available_trans_id_idx",
+                condition=models.Q(is_available=True),
+            ),
+            models.Index(
+                fields=["make", "id"],
+                name="car_available_make_id_idx",
+                condition=models.Q(is_available=True),
+            ),
+            models.Index(
+                fields=["model", "id"],
+                name="car_available_model_id_idx",
+                condition=models.Q(is_available=True),
+            ),
+            models.Index(
+                fields=["color", "id"],
+                name="car_available_color_id_idx",
+                condition=models.Q(is_available=True),
+            ),
+            models.Index(
+                fields=["year"],
+                name="car_available_year_idx",
+                condition=models.Q(is_available=True),
+            ),
+            models.Index(
+                fields=["price_per_day"],
+                name="car_available_price_idx",
+                condition=models.Q(is_available=True),
+            ),
+        ]
+
     def __str__(self):
         return f"{self.year} {self.make} {self.model}"
 
 
+class CarFacetCount(models.Model):
+    """
+    How many available cars share one combination of facet values.
+
+    A summary of ``Car`` rebuilt by ``shared.facets.refresh_facet_summary``: the
+    catalog's facet counts are sums over these rows, which are far fewer than
+    the cars themselves.
+    """
+
+    make = models.CharField(max_length=50)
+    model = models.CharField(max_length=50)
+    year = models.IntegerField()
+    color = models.CharField(max_length=30)
+    # Key of the band in ``shared.facets.PRICE_BANDS``.
+    price_band = models.CharField(max_length=20)
+    transmission = models.CharField(max_length=1, choices=Car.TRANSMISSION_CHOICES)
+    cars = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.year} {self.make} {self.model}: {self.cars}"
+
+
 auditlog.register(Car)
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ImportJob(models.Model):
+    """A file imported in the background by ``shared.tasks.run_import``."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        RUNNING = "running", _("Running")
+        DONE = "done", _("Done")
+        FAILED = "failed", _("Failed")
+
+    # Key of the resource in ``shared.imports.IMPORT_RESOURCES``.
+    resource = models.CharField(_("Resource"), max_length=50)
+    file = models.FileField(_("File"), upload_to="imports/")
+    status = models.CharField(
+        _("Status"),
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    total_rows = models.PositiveIntegerField(_("Total rows"), null=True, blank=True)
+    processed_rows = models.PositiveIntegerField(_("Processed rows"), default=0)
+    new_rows = models.PositiveIntegerField(_("New"), default=0)
+    updated_rows = models.PositiveIntegerField(_("Updated"), default=0)
+    skipped_rows = models.PositiveIntegerField(_("Skipped"), default=0)
+    error_rows = models.PositiveIntegerField(_("Failed"), default=0)
+    errors = models.JSONField(_("Errors"), default=list, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Created by"),
+    )
+    created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
+    finished_at = models.DateTimeField(_("Finished at"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Import job")
+        verbose_name_plural = _("Import jobs")
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.resource} import #{self.pk}"
+
+    @property
+    def progress(self) -> int:
+        """Percentage of the file's rows processed so far."""
+        if self.status == self.Status.DONE:
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(100, self.processed_rows * 100 // self.total_rows)
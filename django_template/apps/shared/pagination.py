@@ -0,0 +1,240 @@
+"""Keyset (seek) pagination for large, stably ordered querysets.
+
+Unlike ``django.core.paginator.Paginator``, the keyset paginator never issues a
+``COUNT(*)`` and never uses ``OFFSET``. Each page is fetched with a ``WHERE``
+clause that seeks past the ordering key of the last row already shown, so page
+N costs the same as page 1 as long as the ordering is backed by an index.
+
+Positions are exchanged with clients as opaque, URL-safe cursor tokens.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Iterator
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.db.models import QuerySet
+
+FORWARD = "n"
+BACKWARD = "p"
+
+# Cursor pointing at the last page: seek backwards from the end of the ordering.
+LAST_PAGE_CURSOR = "last"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor token cannot be decoded."""
+
+
+def encode_cursor(direction: str, values: Sequence[Any]) -> str:
+    """Encode a seek direction and ordering key values into an opaque token."""
+    payload = json.dumps([direction, list(values)], cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[str, list[Any] | None]:
+    """Decode a cursor token into its seek direction and key values.
+
+    Raises:
+        InvalidCursorError: If the token is malformed.
+    """
+    if token == LAST_PAGE_CURSOR:
+        return BACKWARD, None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        direction, values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        msg = "Malformed pagination cursor."
+        raise InvalidCursorError(msg) from exc
+    if direction not in (FORWARD, BACKWARD) or not isinstance(values, list):
+        msg = "Malformed pagination cursor."
+        raise InvalidCursorError(msg)
+    return direction, values
+
+
+@dataclass
+class KeysetPage:
+    """A single page of results returned by :class:`KeysetPaginator`."""
+
+    object_list: list[Any]
+    has_next: bool
+    has_previous: bool
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+    last_cursor: str = LAST_PAGE_CURSOR
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_other_pages(self) -> bool:
+        return self.has_next or self.has_previous
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking on a unique, stable ordering key.
+
+    The last entry of ``ordering`` must be unique (typically ``"id"``) so that
+    every row has a distinct position. Fields may be prefixed with ``-`` for
+    descending order.
+
+    Attributes:
+        queryset: The queryset to paginate.
+        per_page: Maximum number of rows per page.
+        ordering: Field names that make up the ordering key.
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        per_page: int,
+        ordering: Sequence[str] = ("id",),
+    ) -> None:
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self._fields = [name.removeprefix("-") for name in self.ordering]
+
+    def get_page(self, cursor: str | None = None) -> KeysetPage:
+        """
+        Return the page addressed by ``cursor``.
+
+        A missing or malformed cursor yields the first page, mirroring the
+        forgiving behaviour of ``Paginator.get_page``.
+        """
+        direction, values = self._parse_cursor(cursor)
+        rows = list(self._window(direction, values))
+        page = self._page(direction, values, rows)
+        if page is None:
+            page = self._first_page(list(self._window(FORWARD, None)))
+        return page
+
+    async def aget_page(self, cursor: str | None = None) -> KeysetPage:
+        """Async version of :meth:`get_page`, using the async ORM."""
+        direction, values = self._parse_cursor(cursor)
+        rows = [row async for row in self._window(direction, values)]
+        page = self._page(direction, values, rows)
+        if page is None:
+            page = self._first_page([row async for row in self._window(FORWARD, None)])
+        return page
+
+    def _parse_cursor(self, cursor: str | None) -> tuple[str, list[Any] | None]:
+        if not cursor:
+            return FORWARD, None
+        try:
+            direction, values = decode_cursor(cursor)
+        except InvalidCursorError:
+            return FORWARD, None
+        if values is None:
+            return direction, None
+        values = self._key_values(values)
+        if values is None:
+            return FORWARD, None
+        return direction, values
+
+    def _key_values(self, values: list[Any]) -> list[Any] | None:
+        """
+        Convert a cursor's values with their ordering fields' ``to_python()``.
+
+        Cursors come from clients, so returns ``None`` unless there is one
+        valid, non-null value per field.
+        """
+        if len(values) != len(self._fields):
+            return None
+        opts = self.queryset.model._meta  # noqa: SLF001
+        try:
+            values = [
+                opts.get_field(name).to_python(value)
+                for name, value in zip(self._fields, values, strict=True)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            return None
+        if any(value is None for value in values):
+            return None
+        return values
+
+    def _window(self, direction: str, values: list[Any] | None) -> QuerySet:
+        """Return the query for one page plus one extra row."""
+        backward = direction == BACKWARD
+        ordering = self._reversed_ordering() if backward else self.ordering
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, backward=backward))
+        return queryset[: self.per_page + 1]
+
+    def _page(
+        self, direction: str, values: list[Any] | None, rows: list[Any]
+    ) -> KeysetPage | None:
+        """
+        Build the page from the rows fetched by :meth:`_window`.
+
+        Returns ``None`` when a backward seek reached the start of the
+        ordering: callers then serve a full first page rather than a short one.
+        """
+        if direction == FORWARD and values is None:
+            return self._first_page(rows)
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if direction == FORWARD:
+            return self._build_page(rows, has_next=has_more, has_previous=True)
+        if values is not None and not has_more:
+            return None
+        return self._build_page(
+            rows[::-1], has_next=values is not None, has_previous=has_more
+        )
+
+    def _first_page(self, rows: list[Any]) -> KeysetPage:
+        """Build the first page from the rows of an unseeked forward window."""
+        has_more = len(rows) > self.per_page
+        return self._build_page(
+            rows[: self.per_page], has_next=has_more, has_previous=False
+        )
+
+    def _build_page(
+        self, rows: list[Any], *, has_next: bool, has_previous: bool
+    ) -> KeysetPage:
+        page = KeysetPage(
+            object_list=rows, has_next=has_next, has_previous=has_previous
+        )
+        if rows and has_next:
+            page.next_cursor = encode_cursor(FORWARD, self._key(rows[-1]))
+        if rows and has_previous:
+            page.previous_cursor = encode_cursor(BACKWARD, self._key(rows[0]))
+        return page
+
+    def _key(self, row: Any) -> list[Any]:
+        if isinstance(row, dict):
+            return [row[name] for name in self._fields]
+        return [getattr(row, name) for name in self._fields]
+
+    def _reversed_ordering(self) -> list[str]:
+        return [
+            name.removeprefix("-") if name.startswith("-") else f"-{name}"
+            for name in self.ordering
+        ]
+
+    def _seek(self, values: list[Any], *, backward: bool) -> Q:
+        """
+        Build the row-value comparison ``(a, b, c) > (x, y, z)`` as a ``Q``.
+
+        Expanded as ``a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)``
+        with the comparison flipped for descending fields and backward seeks.
+        """
+        predicate = Q()
+        equal_prefix = Q()
+        for name, value in zip(self.ordering, values, strict=True):
+            field_name = name.removeprefix("-")
+            ascending = not name.startswith("-")
+            lookup = "gt" if ascending != backward else "lt"
+            predicate |= equal_prefix & Q(**{f"{field_name}__{lookup}": value})
+            equal_prefix &= Q(**{field_name: value})
+        return predicate
@@ -0,0 +1,76 @@
+"""Primary/replica database routing.
+
+Writes always go to ``default``. Reads are spread across the aliases listed in
+``settings.DATABASE_REPLICAS`` only inside a block that opts in with
+``use_primary(pinned=False)``, and only until something is written in it; the
+pin ends with the block. ``ReplicaPinningMiddleware`` opens such a block for
+each request, unless the client wrote recently and must read its own writes
+despite replication lag.
+
+Everything else reads from the primary: management commands, shell sessions
+and Celery tasks, which often read rows committed just before they were queued.
+A task that can tolerate lag opts in to the replicas the same way.
+"""
+
+import contextlib
+import random
+from collections.abc import Iterator
+from contextvars import ContextVar
+from contextvars import Token
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_pinned: ContextVar[bool] = ContextVar("db_pinned_to_primary", default=True)
+
+
+def is_pinned() -> bool:
+    return _pinned.get()
+
+
+def pin_to_primary() -> None:
+    """Route the remaining reads of the current block to the primary."""
+    _pinned.set(True)
+
+
+def enter_pin_scope(*, pinned: bool) -> Token:
+    """Start a block reading from the primary or, with ``False``, the replicas."""
+    return _pinned.set(pinned)
+
+
+def exit_pin_scope(token: Token) -> None:
+    """End the block started by :func:`enter_pin_scope`, and any pin taken in it."""
+    _pinned.reset(token)
+
+
+@contextlib.contextmanager
+def use_primary(*, pinned: bool = True) -> Iterator[None]:
+    """Route reads inside the block to the primary (or, with ``False``, not)."""
+    token = enter_pin_scope(pinned=pinned)
+    try:
+        yield
+    finally:
+        exit_pin_scope(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or _pinned.get():
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)  # noqa: S311
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas mirror the primary, so rows read from any of them are the
+        # same rows.
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:  # noqa: SLF001
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -1,2 +1,4 @@
+from .car_service import list_available_cars  # noqa: F401
 from .user_service import get_user  # noqa: F401
+from .user_service import get_users  # noqa: F401
 from .user_service import list_users  # noqa: F401
@@ -0,0 +1,5 @@
+from django_template.apps.shared.models.cars.models import Car
+
+
+def list_available_cars():
+    return Car.objects.filter(is_available=True)
@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -9,3 +11,7 @@ def list_users():
 
 def get_user(pk: int):
     return User.objects.only("id", "email", "name").get(pk=pk)
+
+
+def get_users(pks: Iterable[int]):
+    return list_users().filter(pk__in=pks)
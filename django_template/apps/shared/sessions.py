@@ -0,0 +1,87 @@
+"""Cache-backed session engine that takes session I/O off the database.
+
+Set ``SESSION_ENGINE = "django_template.apps.shared.sessions"``. Sessions live
+only in the ``SESSION_CACHE_ALIAS`` cache (Redis in production), with two
+additions over Django's plain cache engine:
+
+* Write coalescing: a session marked as modified is only written back when its
+  data actually changed since it was loaded, so views that re-assign the same
+  values don't cost a cache write per request.
+  With ``SESSION_SAVE_EVERY_REQUEST`` an unchanged session still has its expiry
+  pushed back, via a ``touch`` instead of a full write.
+* Lazy migration: while ``SESSION_DB_FALLBACK`` is on, a session missing from
+  the cache is looked up in the old ``django_session`` table; if found it is
+  moved into the cache and its row deleted once the current transaction
+  commits (which may be ``READ ONLY``, see ``shared.transactions``), so users
+  stay logged in across the switch. ``manage.py drain_db_sessions`` moves the
+  remaining rows in bulk, after which the fallback should be turned off so
+  cache misses stop querying the database.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.contrib.sessions.backends.cache import SessionStore as CacheSessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache.backends.base import BaseCache
+from django.db import router
+from django.db import transaction
+from django.utils import timezone
+
+
+class SessionStore(CacheSessionStore):
+    _cache: BaseCache
+    _loaded_digest: str | None = None
+
+    def load(self):
+        session_key = self.session_key
+        data = super().load()
+        fallback = getattr(settings, "SESSION_DB_FALLBACK", False)
+        if not data and session_key is not None and fallback:
+            data = self._migrate_db_session(session_key)
+        self._loaded_digest = self._digest(data)
+        return data
+
+    def save(self, must_create=False):  # noqa: FBT002
+        unchanged = (
+            self._loaded_digest is not None
+            and self._digest(self._session_data()) == self._loaded_digest
+        )
+        if unchanged and not must_create and self._session_key is not None:
+            if not settings.SESSION_SAVE_EVERY_REQUEST:
+                return
+            if self._cache.touch(self.cache_key, self.get_expiry_age()):
+                return
+        super().save(must_create=must_create)
+        self._loaded_digest = self._digest(self._session_data())
+
+    def _session_data(self) -> dict:
+        """Return the session data as it stands, without loading it."""
+        return self._get_session(no_load=True)  # type: ignore[attr-defined]
+
+    def _digest(self, data: dict) -> str | None:
+        try:
+            payload = self.serializer().dumps(data)
+        except (TypeError, ValueError):
+            return None  # Not comparable: always write.
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _migrate_db_session(self, session_key: str) -> dict:
+        """Move ``session_key`` from the session table into the cache."""
+        try:
+            row = Session.objects.get(
+                session_key=session_key,
+                expire_date__gt=timezone.now(),
+            )
+        except Session.DoesNotExist:
+            return {}
+        data = self.decode(row.session_data)
+        timeout = (row.expire_date - timezone.now()).total_seconds()
+        self._session_key = session_key
+        self._cache.add(self.cache_key, data, max(int(timeout), 1))
+        using = router.db_for_write(Session)
+        transaction.on_commit(
+            lambda: Session.objects.using(using).filter(pk=session_key).delete(),
+            using=using,
+        )
+        return data
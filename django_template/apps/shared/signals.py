@@ -0,0 +1,79 @@
+from auditlog.models import LogEntry
+from celery.signals import task_postrun
+from celery.signals import task_prerun
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_migrate
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from .audit import flush_audit_entries
+from .caching import bump_data_version_on_commit
+from .facets import refresh_facet_summary
+from .facets import schedule_facet_refresh
+from .middleware import current_audit_request
+from .models.cars.models import Car
+from .models.cars.models import CarFacetCount
+from .routers import enter_pin_scope
+from .routers import exit_pin_scope
+
+
+@receiver(post_save, sender=Car)
+@receiver(post_delete, sender=Car)
+def car_changed(sender, using, **kwargs):
+    """Invalidate caches derived from the car table and rebuild its facet summary."""
+    bump_data_version_on_commit(Car, using=using)
+    transaction.on_commit(schedule_facet_refresh, using=using)
+
+
+@receiver(post_migrate)
+def fill_facet_summary(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """Build an empty car facet summary, so the filters work right after deploy."""
+    if sender.label != "shared" or using != DEFAULT_DB_ALIAS:
+        return
+    table = CarFacetCount._meta.db_table  # noqa: SLF001
+    if table not in connections[using].introspection.table_names():
+        return  # Migrated back to before the summary existed.
+    if not CarFacetCount.objects.using(using).exists():
+        refresh_facet_summary()
+
+
+# Pin scopes of the tasks running in this process, by task id.
+_task_pin_scopes = {}
+
+
+@task_prerun.connect
+def task_started(task_id=None, task=None, **kwargs):
+    """Start each task reading from the primary, whatever earlier tasks did."""
+    # An eager task runs inside its caller's scope.
+    if not task.request.is_eager:
+        _task_pin_scopes[task_id] = enter_pin_scope(pinned=True)
+
+
+@task_postrun.connect
+def task_finished(task_id=None, **kwargs):
+    token = _task_pin_scopes.pop(task_id, None)
+    if token is not None:
+        exit_pin_scope(token)
+
+
+@receiver(request_finished)
+@task_postrun.connect
+def flush_audit_log(task=None, **kwargs):
+    """Hand the audit entries buffered by a request or task to Celery."""
+    # An eager task runs inside its caller, which flushes the entries itself.
+    if task is not None and task.request.is_eager:
+        return
+    flush_audit_entries()
+
+
+@receiver(pre_save, sender=LogEntry)
+def attribute_log_entry(sender, instance, **kwargs):
+    """Attribute entries logged during a request to its user and address."""
+    audit_request = current_audit_request.get()
+    if audit_request is not None:
+        audit_request.apply(instance)
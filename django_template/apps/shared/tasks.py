@@ -0,0 +1,63 @@
+from celery import shared_task
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .audit import archive_audit_entries
+from .audit import audit_retention_cutoff
+from .audit import prune_audit_batches
+from .audit import save_audit_entries
+from .facets import refresh_facet_summary
+from .imports import run_import_job
+from .models.imports.models import ImportJob
+from .routers import use_primary
+
+# Entries exported to one archive file; sized to finish within the soft time limit.
+AUDIT_ARCHIVE_BATCH_SIZE = 20_000
+# Seconds a background import may run; large files take far longer than the default.
+IMPORT_TIME_LIMIT = 60 * 60
+
+
+@shared_task(
+    acks_late=True,
+    autoretry_for=(DatabaseError,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def write_audit_entries(payload: str) -> int:
+    """Insert a batch of buffered auditlog entries (see ``shared.audit``)."""
+    return save_audit_entries(payload)
+
+
+@shared_task()
+def archive_audit_log(batch_size: int = AUDIT_ARCHIVE_BATCH_SIZE) -> int:
+    """Archive one batch of expired auditlog entries, then queue the next."""
+    archived = archive_audit_entries(audit_retention_cutoff(), batch_size)
+    if archived:
+        archive_audit_log.delay(batch_size)
+    else:
+        prune_audit_batches()
+    return archived
+
+
+@shared_task()
+def refresh_car_facets() -> int:
+    """Rebuild the car facet summary table (see ``shared.facets``)."""
+    return refresh_facet_summary()
+
+
+@shared_task(soft_time_limit=IMPORT_TIME_LIMIT, time_limit=IMPORT_TIME_LIMIT + 60)
+def run_import(job_id: int) -> str:
+    """Run a background import job (see ``shared.imports``)."""
+    # The job was committed just before the task was queued; a lagging replica
+    # may not have it yet.
+    with use_primary():
+        job = ImportJob.objects.get(pk=job_id)
+        try:
+            run_import_job(job)
+        except Exception as exc:
+            job.status = ImportJob.Status.FAILED
+            job.finished_at = timezone.now()
+            job.errors.append(str(exc))
+            job.save(update_fields=["status", "finished_at", "errors"])
+            raise
+    return job.status
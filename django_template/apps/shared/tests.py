@@ -1 +1,1041 @@
-# Create your tests here.
+import gzip
+import io
+import json
+from datetime import UTC
+from datetime import datetime
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from auditlog.context import set_actor
+from auditlog.models import LogEntry
+from auditlog.signals import post_log
+from celery.signals import task_postrun
+from celery.signals import task_prerun
+from django.apps import apps as django_apps
+from django.contrib.sessions.backends.db import SessionStore as DatabaseSessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import transaction
+from django.db.transaction import Atomic
+from django.http import HttpResponse
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
+from django.utils.functional import empty
+from kombu.exceptions import OperationalError
+from psycopg_pool import ConnectionPool
+
+from django_template.apps.shared.audit import bulk_audit
+from django_template.apps.shared.audit import flush_audit_entries
+from django_template.apps.shared.audit import pending_audit_entries
+from django_template.apps.shared.audit import save_audit_entries
+from django_template.apps.shared.audit import serialize_audit_entries
+from django_template.apps.shared.caching import bump_data_version
+from django_template.apps.shared.caching import data_version_key
+from django_template.apps.shared.caching import get_data_version
+from django_template.apps.shared.counts import approximate_count
+from django_template.apps.shared.counts import cached_count
+from django_template.apps.shared.facets import FacetSelection
+from django_template.apps.shared.facets import facet_counts
+from django_template.apps.shared.facets import refresh_facet_summary
+from django_template.apps.shared.facets import schedule_facet_refresh
+from django_template.apps.shared.imports import csv_chunks
+from django_template.apps.shared.management.commands.cars_create_data import (
+    COPY_COLUMNS,
+)
+from django_template.apps.shared.management.commands.importtime import package_totals
+from django_template.apps.shared.management.commands.importtime import parse_importtime
+from django_template.apps.shared.middleware import REPLICA_PIN_COOKIE
+from django_template.apps.shared.middleware import LazyAuditlogMiddleware
+from django_template.apps.shared.middleware import ReplicaPinningMiddleware
+from django_template.apps.shared.models.cars.models import Car
+from django_template.apps.shared.models.cars.models import CarFacetCount
+from django_template.apps.shared.models.demo.models import DemoCategory
+from django_template.apps.shared.models.demo.models import UnfoldDemoModel
+from django_template.apps.shared.models.imports.models import ImportJob
+from django_template.apps.shared.pagination import LAST_PAGE_CURSOR
+from django_template.apps.shared.pagination import InvalidCursorError
+from django_template.apps.shared.pagination import KeysetPaginator
+from django_template.apps.shared.pagination import decode_cursor
+from django_template.apps.shared.pagination import encode_cursor
+from django_template.apps.shared.routers import ReplicaRouter
+from django_template.apps.shared.routers import use_primary
+from django_template.apps.shared.sessions import SessionStore
+from django_template.apps.shared.signals import fill_facet_summary
+from django_template.apps.shared.tasks import archive_audit_log
+from django_template.apps.shared.tasks import run_import
+from django_template.apps.shared.tasks import write_audit_entries
+from django_template.apps.shared.transactions import read_only
+from django_template.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+CAR_DEFAULTS = {
+    "make": "Toyota",
+    "model": "Sedan",
+    "year": 2020,
+    "color": "Red",
+    "price_per_day": "100.00",
+    "transmission": "A",
+    "is_available": True,
+}
+
+
+def make_cars(count: int, **kwargs) -> list[Car]:
+    defaults = {**CAR_DEFAULTS, **kwargs}
+    return Car.objects.bulk_create(Car(**defaults) for _ in range(count))
+
+
+class TestCursorTokens:
+    def test_round_trip(self):
+        token = encode_cursor("n", [3, "12.50"])
+        assert decode_cursor(token) == ("n", [3, "12.50"])
+
+    def test_last_page_cursor(self):
+        assert decode_cursor(LAST_PAGE_CURSOR) == ("p", None)
+
+    @pytest.mark.parametrize("token", ["not-base64!", "e30", encode_cursor("x", [])])
+    def test_malformed(self, token: str):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(token)
+
+
+class TestKeysetPaginator:
+    def test_walks_forward_and_backward(self):
+        cars = make_cars(7)
+        ids = [car.pk for car in cars]
+        paginator = KeysetPaginator(Car.objects.all(), 3)
+
+        first = paginator.get_page()
+        assert [car.pk for car in first] == ids[:3]
+        assert first.has_next
+        assert not first.has_previous
+
+        second = paginator.get_page(first.next_cursor)
+        assert [car.pk for car in second] == ids[3:6]
+        assert second.has_previous
+
+        third = paginator.get_page(second.next_cursor)
+        assert [car.pk for car in third] == ids[6:]
+        assert not third.has_next
+
+        back = paginator.get_page(third.previous_cursor)
+        assert [car.pk for car in back] == ids[3:6]
+        assert back.has_next
+
+    def test_previous_from_second_page_returns_full_first_page(self):
+        ids = [car.pk for car in make_cars(5)]
+        paginator = KeysetPaginator(Car.objects.all(), 2)
+        second = paginator.get_page(paginator.get_page().next_cursor)
+
+        first = paginator.get_page(second.previous_cursor)
+
+        assert [car.pk for car in first] == ids[:2]
+        assert not first.has_previous
+
+    def test_last_page(self):
+        ids = [car.pk for car in make_cars(7)]
+        page = KeysetPaginator(Car.objects.all(), 3).get_page(LAST_PAGE_CURSOR)
+        assert [car.pk for car in page] == ids[4:]
+        assert not page.has_next
+        assert page.has_previous
+
+    def test_composite_descending_ordering(self):
+        cheap = make_cars(2, price_per_day="50.00")
+        pricey = make_cars(2, price_per_day="150.00")
+        paginator = KeysetPaginator(Car.objects.all(), 3, ("-price_per_day", "id"))
+
+        first = paginator.get_page()
+        second = paginator.get_page(first.next_cursor)
+
+        expected = [*pricey, *cheap]
+        assert [car.pk for car in first] == [car.pk for car in expected[:3]]
+        assert [car.pk for car in second] == [expected[3].pk]
+
+    def test_invalid_cursor_returns_first_page(self):
+        ids = [car.pk for car in make_cars(2)]
+        page = KeysetPaginator(Car.objects.all(), 5).get_page("garbage")
+        assert [car.pk for car in page] == ids
+
+    @pytest.mark.parametrize("values", [["abc"], [{}], [None], [[1]], ["1e400"]])
+    def test_cursor_with_wrong_value_type_returns_first_page(self, values):
+        ids = [car.pk for car in make_cars(2)]
+        cursor = encode_cursor("n", values)
+
+        page = KeysetPaginator(Car.objects.all(), 5).get_page(cursor)
+
+        assert [car.pk for car in page] == ids
+
+    def test_no_count_query(self, django_assert_num_queries):
+        make_cars(4)
+        paginator = KeysetPaginator(Car.objects.all(), 2)
+        cursor = paginator.get_page().next_cursor
+        with django_assert_num_queries(1):
+            paginator.get_page(cursor)
+
+
+class TestCachedCount:
+    def test_counts_and_caches_per_filter(self, django_assert_num_queries):
+        make_cars(3, transmission="A")
+        make_cars(2, transmission="M")
+
+        assert cached_count(Car.objects.filter(transmission="A")) == 3  # noqa: PLR2004
+        assert cached_count(Car.objects.filter(transmission="M")) == 2  # noqa: PLR2004
+        with django_assert_num_queries(0):
+            assert cached_count(Car.objects.filter(transmission="A")) == 3  # noqa: PLR2004
+
+    def test_save_and_delete_invalidate(self, django_capture_on_commit_callbacks):
+        car = make_cars(1)[0]
+        assert cached_count(Car.objects.all()) == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Car.objects.create(
+                make="Ford",
+                model="Truck",
+                year=2019,
+                color="Black",
+                price_per_day="120.00",
+                transmission="M",
+            )
+        assert cached_count(Car.objects.all()) == 2  # noqa: PLR2004
+
+        with django_capture_on_commit_callbacks(execute=True):
+            car.delete()
+        assert cached_count(Car.objects.all()) == 1
+
+    def test_version_is_bumped_after_commit(self, django_capture_on_commit_callbacks):
+        version = get_data_version(Car)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Car.objects.create(**CAR_DEFAULTS)
+            # A concurrent reader still caches under the old version.
+            assert get_data_version(Car) == version
+
+        assert get_data_version(Car) != version
+
+    def test_row_versions_expire(self, settings, monkeypatch):
+        settings.DATA_VERSION_ROW_TIMEOUT = 60
+        timeouts = {}
+
+        def record_set(key, value, timeout=None):
+            timeouts[key] = timeout
+
+        monkeypatch.setattr(cache, "set", record_set)
+        bump_data_version(User)
+        bump_data_version(User, 1)
+
+        assert timeouts == {
+            data_version_key(User): None,
+            data_version_key(User, 1): 60,
+        }
+
+    def test_small_tables_count_exactly(self, settings):
+        settings.COUNT_ESTIMATE_THRESHOLD = 10**9
+        make_cars(4)
+        assert approximate_count(Car.objects.all()) == 4  # noqa: PLR2004
+
+
+class TestFacets:
+    def options(self, groups, name):
+        group = next(group for group in groups if group.name == name)
+        return {option.value: option.count for option in group.options}
+
+    def test_counts_exclude_own_facet_filter(self):
+        make_cars(2, make="Ford", transmission="A", price_per_day="40.00")
+        make_cars(3, make="Honda", transmission="M", price_per_day="120.00")
+        make_cars(1, make="Ford", transmission="M", year=2016)
+        make_cars(1, make="Ford", is_available=False)
+        refresh_facet_summary()
+        selection = FacetSelection.from_query(QueryDict("make=Ford"))
+
+        groups = facet_counts(selection)
+
+        assert self.options(groups, "make") == {"Ford": 3, "Honda": 3}
+        assert self.options(groups, "transmission") == {"A": 2, "M": 1}
+        assert self.options(groups, "price_band") == {"under-50": 2, "100-150": 1}
+        assert self.options(groups, "year") == {"2016": 1, "2020": 2}
+
+    def test_selected_options_are_kept_and_labelled(self):
+        make_cars(1, transmission="A")
+        refresh_facet_summary()
+        selection = FacetSelection.from_query(
+            QueryDict("transmission=M&make=Ford&year_min=2030"),
+        )
+
+        groups = {group.name: group for group in facet_counts(selection)}
+
+        transmission = groups["transmission"]
+        assert [(o.label, o.count, o.selected) for o in transmission.options] == [
+            ("Manual", 0, True),
+        ]
+        assert groups["year"].selected == ("2030", "")
+
+    @pytest.mark.parametrize("value", ["²", "abc", "99999999999", "-5", ""])
+    def test_invalid_year_bounds_are_ignored(self, value):
+        selection = FacetSelection.from_query(
+            QueryDict(f"year_min={value}&year_max=2020"),
+        )
+
+        assert selection.get("year") == ("", "2020")
+        assert selection.apply(Car.objects.all()).count() == 0
+
+    def test_apply_filters_queryset(self):
+        make_cars(2, year=2018, price_per_day="160.00")
+        make_cars(2, year=2022, price_per_day="160.00")
+        make_cars(1, year=2018, price_per_day="60.00")
+        selection = FacetSelection.from_query(
+            QueryDict("year_max=2019&price_band=150-plus&price_band=bogus"),
+        )
+
+        assert selection.apply(Car.objects.all()).count() == 2  # noqa: PLR2004
+
+    def test_summary_groups_available_cars(self):
+        make_cars(2, make="Ford", price_per_day="40.00")
+        make_cars(1, make="Ford", price_per_day="120.00")
+        make_cars(1, make="Ford", is_available=False)
+
+        assert refresh_facet_summary() == 2  # noqa: PLR2004
+        assert refresh_facet_summary() == 2  # noqa: PLR2004
+
+        rows = CarFacetCount.objects.order_by("price_band")
+        assert [(row.price_band, row.cars) for row in rows] == [
+            ("100-150", 1),
+            ("under-50", 2),
+        ]
+
+    def test_summary_is_filled_after_migrate(self):
+        make_cars(2)
+        shared = django_apps.get_app_config("shared")
+
+        fill_facet_summary(sender=shared, using="default")
+        assert CarFacetCount.objects.get().cars == 2  # noqa: PLR2004
+
+        make_cars(1)
+        fill_facet_summary(sender=shared, using="default")
+        # Not empty: left to the regular refreshes.
+        assert CarFacetCount.objects.get().cars == 2  # noqa: PLR2004
+
+    def test_counts_are_cached_until_summary_refresh(self, django_assert_num_queries):
+        car = make_cars(1)[0]
+        refresh_facet_summary()
+        selection = FacetSelection({})
+        facet_counts(selection)
+
+        car.save()
+        with django_assert_num_queries(0):
+            facet_counts(selection)
+
+        refresh_facet_summary()
+        with django_assert_num_queries(1):
+            facet_counts(selection)
+
+    def test_refresh_is_scheduled_once_per_delay(self, settings):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        make_cars(1)
+        schedule_facet_refresh()
+        make_cars(1)
+        schedule_facet_refresh()
+
+        assert CarFacetCount.objects.get().cars == 1
+
+    def test_car_writes_schedule_a_refresh(
+        self, settings, django_capture_on_commit_callbacks
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        with django_capture_on_commit_callbacks(execute=True):
+            Car.objects.create(**CAR_DEFAULTS)
+            Car.objects.create(**CAR_DEFAULTS)
+
+        assert CarFacetCount.objects.get().cars == 2  # noqa: PLR2004
+
+
+class TestCarsCreateDataCommand:
+    def test_default_saves_with_auditlog(self):
+        call_command("cars_create_data", "--count", "3", stdout=StringIO())
+        assert Car.objects.count() == 3  # noqa: PLR2004
+        assert LogEntry.objects.get_for_model(Car).count() == 3  # noqa: PLR2004
+
+    def test_save_without_auditlog(self):
+        call_command(
+            "cars_create_data", "--count", "2", "--no-auditlog", stdout=StringIO()
+        )
+        assert not LogEntry.objects.get_for_model(Car).exists()
+
+    def test_bulk_is_reproducible_with_seed(self):
+        args = ("--count", "1_000", "--batch-size", "300", "--method", "bulk")
+        call_command("cars_create_data", *args, "--seed", "7", stdout=StringIO())
+        first = list(Car.objects.order_by("id").values_list(*COPY_COLUMNS))
+        assert not LogEntry.objects.get_for_model(Car).exists()
+        Car.objects.all().delete()
+
+        call_command("cars_create_data", *args, "--seed", "7", stdout=StringIO())
+        second = list(Car.objects.order_by("id").values_list(*COPY_COLUMNS))
+
+        assert len(first) == 1_000  # noqa: PLR2004
+        assert first == second
+
+    @pytest.mark.parametrize("batch_size", ["0", "-5"])
+    def test_rejects_non_positive_batch_size(self, batch_size):
+        with pytest.raises(CommandError, match="batch-size"):
+            call_command(
+                "cars_create_data", "--batch-size", batch_size, stdout=StringIO()
+            )
+
+    def test_bulk_bumps_data_version(self):
+        version = get_data_version(Car)
+        call_command("cars_create_data", "--method", "bulk", stdout=StringIO())
+        assert get_data_version(Car) != version
+
+
+class TestReplicaRouting:
+    @pytest.fixture(autouse=True)
+    def _replicas(self, settings):
+        settings.DATABASE_REPLICAS = ["replica_1"]
+
+    def test_reads_go_to_replicas_until_a_write(self):
+        router = ReplicaRouter()
+        with use_primary(pinned=False):
+            assert router.db_for_read(Car) == "replica_1"
+            assert router.db_for_write(Car) == "default"
+            assert router.db_for_read(Car) == "default"
+
+    def test_pin_ends_with_its_block(self):
+        router = ReplicaRouter()
+        assert router.db_for_read(Car) == "default"
+        with use_primary(pinned=False):
+            router.db_for_write(Car)
+        with use_primary(pinned=False):
+            assert router.db_for_read(Car) == "replica_1"
+        assert router.db_for_read(Car) == "default"
+
+    def test_tasks_start_on_the_primary(self):
+        router = ReplicaRouter()
+        with use_primary(pinned=False):
+            task_prerun.send(sender=run_import, task_id="1", task=run_import)
+            assert router.db_for_read(Car) == "default"
+            task_postrun.send(sender=run_import, task_id="1", task=run_import)
+            assert router.db_for_read(Car) == "replica_1"
+
+    def test_no_replicas_configured(self, settings):
+        settings.DATABASE_REPLICAS = []
+        assert ReplicaRouter().db_for_read(Car) == "default"
+
+    def test_replicas_are_never_migrated(self):
+        router = ReplicaRouter()
+        assert router.allow_migrate("default", "shared")
+        assert not router.allow_migrate("replica_1", "shared")
+
+    def test_middleware_pins_after_unsafe_requests(self, rf):
+        seen = []
+
+        def view(request):
+            seen.append(ReplicaRouter().db_for_read(Car))
+            return HttpResponse()
+
+        middleware = ReplicaPinningMiddleware(view)
+        read = middleware(rf.get("/"))
+        written = middleware(rf.post("/"))
+        request = rf.get("/")
+        request.COOKIES[REPLICA_PIN_COOKIE] = "1"
+        sticky = middleware(request)
+
+        assert seen == ["replica_1", "default", "default"]
+        assert REPLICA_PIN_COOKIE not in read.cookies
+        assert REPLICA_PIN_COOKIE in written.cookies
+        assert REPLICA_PIN_COOKIE not in sticky.cookies
+
+
+class TestReadOnlyTransactions:
+    """Transactions opened per endpoint, on top of the test's own."""
+
+    @pytest.fixture
+    def atomic_blocks(self, monkeypatch) -> list[str]:
+        entered = []
+        enter = Atomic.__enter__
+
+        def counting_enter(self):
+            entered.append(self.using)
+            return enter(self)
+
+        monkeypatch.setattr(Atomic, "__enter__", counting_enter)
+        return entered
+
+    @pytest.mark.parametrize(
+        "url",
+        ["/cars", "/people/", "/api/public-users/"],
+    )
+    def test_reads_run_in_autocommit(self, client, user: User, atomic_blocks, url):
+        client.force_login(user)
+        atomic_blocks.clear()
+
+        response = client.get(url)
+
+        assert response.status_code == HTTPStatus.OK
+        assert atomic_blocks == []
+
+    def test_reads_in_read_only_transaction(
+        self, client, user: User, atomic_blocks, settings
+    ):
+        settings.READ_ONLY_VIEW_TRANSACTIONS = True
+        client.force_login(user)
+        atomic_blocks.clear()
+
+        client.get("/cars")
+
+        assert atomic_blocks == ["default"]
+
+    def test_writable_viewset_reads_stay_atomic(
+        self, client, user: User, atomic_blocks
+    ):
+        client.force_login(user)
+        atomic_blocks.clear()
+
+        response = client.get("/api/users/me/")
+
+        assert response.status_code == HTTPStatus.OK
+        assert atomic_blocks
+
+    def test_writes_stay_atomic(self, client, user: User, atomic_blocks):
+        client.force_login(user)
+        atomic_blocks.clear()
+
+        response = client.patch(
+            f"/api/users/{user.pk}/",
+            {"name": "Renamed"},
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert atomic_blocks
+
+
+class TestDatabasePool:
+    def test_pool_package_is_installed(self):
+        # DJANGO_DATABASE_POOL makes the postgresql backend build a psycopg_pool
+        # ConnectionPool from OPTIONS["pool"]; check production's options fit.
+        pool = ConnectionPool(open=False, min_size=2, max_size=10, timeout=10)
+
+        assert pool.closed
+        assert (pool.min_size, pool.max_size) == (2, 10)
+
+
+class TestBenchDbConnections:
+    def test_reports_connection_reuse(self):
+        out = StringIO()
+        call_command(
+            "bench_db_connections",
+            "--requests",
+            "6",
+            "--concurrency",
+            "2",
+            stdout=out,
+        )
+        assert "6 requests on 2 threads" in out.getvalue()
+        assert "physical connections served 6 requests" in out.getvalue()
+
+
+class TestImportTime:
+    def test_parse_and_aggregate(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |     wagtail.models\n"
+            "import time:        50 |        150 |   wagtail\n"
+            "import time:        20 |         20 | django\n"
+        )
+        timings = parse_importtime(output)
+        assert [timing.module for timing in timings] == [
+            "wagtail.models",
+            "wagtail",
+            "django",
+        ]
+        assert package_totals(timings) == {"wagtail": 150, "django": 20}
+
+    def test_slim_profile_boots(self):
+        out = StringIO()
+        call_command(
+            "importtime",
+            "--profile",
+            "slim",
+            "--target",
+            "web",
+            "--top",
+            "1",
+            stdout=out,
+        )
+        assert "slim profile" in out.getvalue()
+
+
+class TestCacheSessions:
+    @pytest.fixture(autouse=True)
+    def _session_cache(self, settings):
+        settings.SESSION_ENGINE = "django_template.apps.shared.sessions"
+        settings.SESSION_CACHE_ALIAS = "default"
+
+    def test_unchanged_session_is_not_written(self, monkeypatch):
+        store = SessionStore()
+        store["cart"] = [1, 2]
+        store.create()
+
+        writes = []
+        loaded = SessionStore(store.session_key)
+        monkeypatch.setattr(
+            loaded._cache,  # noqa: SLF001
+            "set",
+            lambda *args, **kwargs: writes.append(args),
+        )
+        loaded["cart"] = [1, 2]
+        loaded.save()
+        assert writes == []
+
+        loaded["cart"] = [1, 2, 3]
+        loaded.save()
+        assert len(writes) == 1
+
+    def test_unchanged_session_expiry_is_extended(self, settings, monkeypatch):
+        settings.SESSION_SAVE_EVERY_REQUEST = True
+        store = SessionStore()
+        store["cart"] = [1, 2]
+        store.create()
+
+        touches = []
+
+        def touch(key, timeout):
+            touches.append((key, timeout))
+            return True
+
+        loaded = SessionStore(store.session_key)
+        monkeypatch.setattr(loaded._cache, "touch", touch)  # noqa: SLF001
+        loaded["cart"] = [1, 2]
+        loaded.save()
+        assert touches == [(loaded.cache_key, loaded.get_expiry_age())]
+
+    def test_database_session_moves_to_cache(
+        self, settings, django_capture_on_commit_callbacks
+    ):
+        settings.SESSION_DB_FALLBACK = True
+        db_store = DatabaseSessionStore()
+        db_store["user"] = "42"
+        db_store.create()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            store = SessionStore(db_store.session_key)
+            assert store["user"] == "42"
+
+        assert not Session.objects.filter(session_key=db_store.session_key).exists()
+        assert SessionStore(db_store.session_key)["user"] == "42"
+
+    def test_read_only_view_deletes_the_row_after_commit(
+        self, rf, settings, django_capture_on_commit_callbacks
+    ):
+        settings.SESSION_DB_FALLBACK = True
+        settings.READ_ONLY_VIEW_TRANSACTIONS = True
+        db_store = DatabaseSessionStore()
+        db_store["user"] = "42"
+        db_store.create()
+        seen = []
+
+        @read_only
+        def view(request):
+            seen.append(request.session["user"])
+            seen.append(Session.objects.filter(pk=db_store.session_key).exists())
+            return HttpResponse()
+
+        request = rf.get("/")
+        request.session = SessionStore(db_store.session_key)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        assert seen == ["42", True]
+        assert not Session.objects.filter(pk=db_store.session_key).exists()
+
+    def test_database_fallback_is_off_by_default(self):
+        db_store = DatabaseSessionStore()
+        db_store["user"] = "42"
+        db_store.create()
+
+        with CaptureQueriesContext(connection) as queries:
+            store = SessionStore(db_store.session_key)
+            assert "user" not in store
+
+        assert len(queries) == 0
+        assert Session.objects.filter(session_key=db_store.session_key).exists()
+
+    def test_drain_db_sessions(self):
+        db_store = DatabaseSessionStore()
+        db_store["user"] = "42"
+        db_store.create()
+
+        out = StringIO()
+        call_command("drain_db_sessions", stdout=out)
+
+        assert "Moved 1 sessions" in out.getvalue()
+        assert not Session.objects.exists()
+        assert SessionStore(db_store.session_key)["user"] == "42"
+
+
+class TestBufferedAuditlog:
+    @pytest.fixture(autouse=True)
+    def _async_auditlog(self, settings):
+        settings.AUDITLOG_ASYNC = True
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        yield
+        pending_audit_entries().clear()
+
+    def test_entries_are_written_in_a_batch_after_commit(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            (car,) = make_cars(1)
+            car.save()  # bulk_create doesn't log; the first save is an update.
+            car.color = "Blue"
+            car.save()
+            car.delete()
+        assert not LogEntry.objects.exists()
+
+        assert flush_audit_entries() == 2  # noqa: PLR2004
+
+        entries = LogEntry.objects.get_for_model(Car).order_by("timestamp", "id")
+        assert [entry.action for entry in entries] == [
+            LogEntry.Action.UPDATE,
+            LogEntry.Action.DELETE,
+        ]
+        assert entries[0].changes["color"] == ["Red", "Blue"]
+
+    def test_rolled_back_changes_are_not_logged(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            Car.objects.create(**CAR_DEFAULTS)
+            with transaction.atomic():
+                Car.objects.create(**CAR_DEFAULTS)
+                transaction.set_rollback(True)
+
+        assert len(pending_audit_entries()) == 1
+
+    def test_actor_is_captured_at_change_time(
+        self, user: User, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True), set_actor(user):
+            Car.objects.create(**CAR_DEFAULTS)
+        flush_audit_entries()
+
+        assert LogEntry.objects.get_for_model(Car).get().actor == user
+
+    def test_broker_failure_writes_inline(
+        self, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        def unavailable(*args, **kwargs):
+            raise OperationalError
+
+        monkeypatch.setattr(write_audit_entries, "apply_async", unavailable)
+        with django_capture_on_commit_callbacks(execute=True):
+            Car.objects.create(**CAR_DEFAULTS)
+        flush_audit_entries()
+
+        assert LogEntry.objects.get_for_model(Car).count() == 1
+
+    def test_batches_flush_when_full(
+        self, settings, django_capture_on_commit_callbacks
+    ):
+        settings.AUDITLOG_BATCH_SIZE = 2
+        with django_capture_on_commit_callbacks(execute=True):
+            for _ in range(3):
+                Car.objects.create(**CAR_DEFAULTS)
+
+        assert LogEntry.objects.get_for_model(Car).count() == 2  # noqa: PLR2004
+        assert len(pending_audit_entries()) == 1
+
+    def test_redelivered_batch_is_written_once(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            Car.objects.create(**CAR_DEFAULTS)
+        payload = serialize_audit_entries(pending_audit_entries())
+
+        assert save_audit_entries(payload) == 1
+        assert save_audit_entries(payload) == 0
+        assert LogEntry.objects.count() == 1
+
+    def test_post_log_is_sent_once_committed(self, django_capture_on_commit_callbacks):
+        logged = []
+
+        def receiver(sender, log_entry, log_created, **kwargs):
+            logged.append((sender, log_entry.action, log_created))
+
+        post_log.connect(receiver)
+        try:
+            with django_capture_on_commit_callbacks(execute=True):
+                Car.objects.create(**CAR_DEFAULTS)
+                assert logged == []
+        finally:
+            post_log.disconnect(receiver)
+
+        assert logged == [(Car, LogEntry.Action.CREATE, True)]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_requests_flush_their_entries(self, admin_client):
+        car = make_cars(1)[0]
+        admin_client.post(
+            reverse("admin:shared_car_delete", args=[car.pk]), {"post": "yes"}
+        )
+
+        assert (
+            LogEntry.objects.get_for_model(Car)
+            .filter(action=LogEntry.Action.DELETE)
+            .exists()
+        )
+
+
+class TestAuditArchive:
+    @pytest.fixture(autouse=True)
+    def _storage(self, settings):
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        }
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        settings.AUDITLOG_RETENTION_DAYS = 30
+
+    def test_expired_months_are_exported_and_deleted(self):
+        cars = [Car.objects.create(**CAR_DEFAULTS) for _ in range(4)]
+        entries = LogEntry.objects.get_for_model(Car).order_by("id")
+        for entry, timestamp in zip(
+            entries[:3], ["2025-01-05", "2025-01-20", "2025-02-01"], strict=True
+        ):
+            entry.timestamp = datetime.fromisoformat(timestamp).replace(tzinfo=UTC)
+            entry.save()
+
+        archive_audit_log(batch_size=1)
+
+        remaining = LogEntry.objects.get_for_model(Car).get()
+        assert remaining.object_id == cars[-1].pk
+        _dirs, january = default_storage.listdir("auditlog/2025-01")
+        assert len(january) == 2  # noqa: PLR2004
+        (february,) = default_storage.listdir("auditlog/2025-02")[1]
+        with default_storage.open(f"auditlog/2025-02/{february}") as archive:
+            (line,) = gzip.decompress(archive.read()).splitlines()
+        row = json.loads(line)
+        assert row["object_id"] == cars[2].pk
+        assert row["timestamp"] == "2025-02-01T00:00:00+00:00"
+
+
+class TestBulkAudit:
+    @pytest.fixture(autouse=True)
+    def _threshold(self, settings):
+        settings.AUDITLOG_BULK_THRESHOLD = 3
+
+    @pytest.fixture
+    def categories(self) -> list[DemoCategory]:
+        categories = [DemoCategory.objects.create(name=f"c{i}") for i in range(3)]
+        LogEntry.objects.all().delete()
+        return categories
+
+    def test_updates_are_logged_as_one_changeset(self, categories):
+        with bulk_audit(DemoCategory, len(categories)):
+            for category in categories:
+                category.name = "merged"
+                category.save()
+
+        entry = LogEntry.objects.get()
+        assert entry.action == LogEntry.Action.UPDATE
+        assert entry.object_repr == "3 Demo Categories"
+        assert entry.changes == {"name": [["c0", "c1", "c2"], ["merged"]]}
+        assert entry.additional_data == {
+            "bulk": True,
+            "object_ids": [category.pk for category in categories],
+            "rows_changed": {"name": 3},
+        }
+
+    def test_small_operations_are_logged_per_row(self, categories):
+        with bulk_audit(DemoCategory, 2):
+            for category in categories[:2]:
+                category.delete()
+
+        assert LogEntry.objects.filter(action=LogEntry.Action.DELETE).count() == 2  # noqa: PLR2004
+
+    def test_admin_actions_log_one_changeset(self, admin_client, categories):
+        admin_client.post(
+            reverse("admin:shared_democategory_changelist"),
+            {
+                "action": "delete_selected",
+                "_selected_action": [category.pk for category in categories],
+                "post": "yes",
+            },
+        )
+
+        assert not DemoCategory.objects.exists()
+        entry = LogEntry.objects.get_for_model(DemoCategory).get()
+        assert entry.action == LogEntry.Action.DELETE
+        assert sorted(entry.additional_data["object_ids"]) == sorted(
+            category.pk for category in categories
+        )
+
+
+class TestLazyAuditlogMiddleware:
+    def lazy_user(self, user: User) -> SimpleLazyObject:
+        return SimpleLazyObject(lambda: User.objects.get(pk=user.pk))
+
+    def test_reads_never_resolve_the_user(self, rf, user: User):
+        request = rf.get("/cars")
+        request.user = self.lazy_user(user)
+
+        LazyAuditlogMiddleware(lambda request: HttpResponse())(request)
+
+        assert request.user._wrapped is empty  # noqa: SLF001
+
+    def test_writes_are_attributed_to_the_request(self, rf, user: User):
+        request = rf.post("/cars", REMOTE_ADDR="203.0.113.9")
+        request.user = self.lazy_user(user)
+
+        def view(request):
+            Car.objects.create(**CAR_DEFAULTS)
+            return HttpResponse()
+
+        LazyAuditlogMiddleware(view)(request)
+
+        entry = LogEntry.objects.get_for_model(Car).get()
+        assert entry.actor == user
+        assert entry.actor_email == user.email
+        assert entry.remote_addr == "203.0.113.9"
+
+    def test_admin_save_through_the_middleware_stack(self, admin_client, admin_user):
+        category = DemoCategory.objects.create(name="Old")
+        LogEntry.objects.all().delete()
+
+        response = admin_client.post(
+            reverse("admin:shared_democategory_change", args=[category.pk]),
+            {"name": "New", "description": ""},
+        )
+
+        assert response.status_code == HTTPStatus.FOUND
+        entry = LogEntry.objects.get_for_object(category).get()
+        assert entry.changes["name"] == ["Old", "New"]
+        assert entry.actor == admin_user
+        assert entry.remote_addr == "127.0.0.1"
+
+    def test_benchmark_reports_every_variant(self, user: User):
+        out = StringIO()
+        call_command(
+            "bench_auditlog_middleware",
+            "--requests",
+            "5",
+            "--authenticated",
+            stdout=out,
+        )
+        lines = out.getvalue().splitlines()
+        assert [line.split(":")[0].strip() for line in lines] == [
+            "none",
+            "auditlog",
+            "lazy",
+        ]
+
+
+class TestBackgroundImport:
+    @pytest.fixture(autouse=True)
+    def _storage(self, settings):
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        }
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+
+    def make_job(self, csv_text: str) -> ImportJob:
+        job = ImportJob(resource="unfold_demo")
+        job.file.save("demo.csv", ContentFile(csv_text.encode()))
+        return job
+
+    def test_csv_is_read_in_chunks(self):
+        lines = ["id,title", *(f",Title {i}" for i in range(5))]
+        chunks = list(csv_chunks(io.BytesIO("\n".join(lines).encode()), 2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert chunks[0].headers == ["id", "title"]
+        assert chunks[2]["title"] == ["Title 4"]
+
+    def test_job_imports_chunks_in_bulk(self, settings):
+        settings.AUDITLOG_BULK_THRESHOLD = 1
+        existing = UnfoldDemoModel.objects.create(title="Old", location="1,1")
+        unchanged = UnfoldDemoModel.objects.create(title="Same", location="1,1")
+        job = self.make_job(
+            "id,title,status,location\n"
+            f'{existing.pk},New,published,"1,1"\n'
+            f'{unchanged.pk},Same,draft,"1,1"\n'
+            + "".join(f',Row {i},draft,"1,1"\n' for i in range(3))
+        )
+
+        run_import(job.pk)
+
+        job.refresh_from_db()
+        assert job.status == ImportJob.Status.DONE
+        assert (job.total_rows, job.processed_rows, job.progress) == (5, 5, 100)
+        assert (job.new_rows, job.updated_rows, job.skipped_rows) == (3, 1, 1)
+        existing.refresh_from_db()
+        assert (existing.title, existing.status) == ("New", "published")
+        changesets = LogEntry.objects.filter(additional_data__bulk=True)
+        assert {entry.action for entry in changesets} == {
+            LogEntry.Action.CREATE,
+            LogEntry.Action.UPDATE,
+        }
+        update = changesets.get(action=LogEntry.Action.UPDATE)
+        assert update.changes["title"] == [["Old"], ["New"]]
+        assert update.changes["status"] == [["draft"], ["published"]]
+
+    def test_small_chunks_log_one_entry_per_row(self, settings):
+        settings.AUDITLOG_BULK_THRESHOLD = 10
+        existing = UnfoldDemoModel.objects.create(title="Old", location="1,1")
+        LogEntry.objects.all().delete()
+        job = self.make_job(
+            f'id,title,location\n{existing.pk},New,"1,1"\n,Added,"1,1"\n',
+        )
+
+        run_import(job.pk)
+
+        entries = LogEntry.objects.get_for_model(UnfoldDemoModel)
+        assert not entries.filter(additional_data__bulk=True).exists()
+        update = entries.get(action=LogEntry.Action.UPDATE)
+        assert update.object_id == existing.pk
+        assert update.changes["title"] == ["Old", "New"]
+        assert entries.get(action=LogEntry.Action.CREATE).object_repr == "Added"
+
+    def test_job_is_read_from_the_primary(self, settings):
+        job = self.make_job("id,title\n")
+        # Reading from this unconfigured replica would fail.
+        settings.DATABASE_REPLICAS = ["replica_1"]
+
+        with use_primary(pinned=False):
+            run_import(job.pk)
+
+        job.refresh_from_db(using="default")
+        assert job.status == ImportJob.Status.DONE
+
+    def test_failed_chunks_are_reported(self):
+        job = self.make_job("id,title\n999999,Missing\n")
+
+        run_import(job.pk)
+
+        job.refresh_from_db()
+        assert job.status == ImportJob.Status.DONE
+        assert job.error_rows == 1
+        assert job.errors
+
+    def test_admin_queues_a_job(self, admin_client, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            response = admin_client.post(
+                reverse("admin:shared_unfolddemomodel_background_import"),
+                {"import_file": SimpleUploadedFile("demo.csv", b"id,title\n")},
+            )
+
+        job = ImportJob.objects.get()
+        assert response.url == reverse("admin:shared_importjob_change", args=[job.pk])
+        assert job.total_rows == 0
+        assert job.status == ImportJob.Status.DONE
@@ -0,0 +1,71 @@
+"""Opting read-only views out of ``ATOMIC_REQUESTS``.
+
+``ATOMIC_REQUESTS`` wraps every view in ``BEGIN``/``COMMIT`` and keeps the
+connection in a transaction for the whole view. Views that only read don't
+need that: decorate them with :func:`read_only` (or mix
+:class:`ReadOnlyViewMixin` into class-based views and viewsets) and their safe
+requests run in autocommit, or in a ``READ ONLY`` transaction when
+``settings.READ_ONLY_VIEW_TRANSACTIONS`` is enabled. Unsafe requests reaching
+such a view are still wrapped in a regular transaction, except for async views,
+which cannot hold a transaction across awaits and always run in autocommit.
+"""
+
+import contextlib
+from collections.abc import Iterator
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.db import transaction
+from django.utils.decorators import method_decorator
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def read_only(view):
+    """Run safe requests to ``view`` outside ``ATOMIC_REQUESTS``."""
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+    else:
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in SAFE_METHODS:
+                with transaction.atomic():
+                    return view(request, *args, **kwargs)
+            if settings.READ_ONLY_VIEW_TRANSACTIONS:
+                with read_only_transaction():
+                    return view(request, *args, **kwargs)
+            return view(request, *args, **kwargs)
+
+    return transaction.non_atomic_requests(wrapper)
+
+
+class ReadOnlyViewMixin:
+    """Class-based view and viewset counterpart of :func:`read_only`."""
+
+    @method_decorator(read_only)
+    def dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+
+
+@contextlib.contextmanager
+def read_only_transaction(using: str = DEFAULT_DB_ALIAS) -> Iterator[None]:
+    """
+    Run the block in a transaction that rejects writes.
+
+    On PostgreSQL this is ``SET TRANSACTION READ ONLY``, which also gives the
+    block one consistent snapshot; other backends get a plain transaction.
+    """
+    with transaction.atomic(using=using):
+        connection = connections[using]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION READ ONLY")
+        yield
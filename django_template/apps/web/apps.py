@@ -1,6 +1,12 @@
+import contextlib
+
 from django.apps import AppConfig
 
 
 class WebConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "django_template.apps.web"
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import django_template.apps.web.checks  # noqa: F401, PLC0415
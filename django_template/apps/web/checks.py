@@ -0,0 +1,84 @@
+"""Database system checks for the car catalog query plans.
+
+These checks only run when a database is requested explicitly, e.g.::
+
+    python manage.py check --database default
+
+The first page the ``index`` view serves for each of ``CATALOG_FILTERS`` (every
+facet alone and some combinations) is run through ``EXPLAIN``, and the check
+fails if PostgreSQL plans a sequential scan over a table estimated to hold more
+than ``QUERY_PLAN_SEQ_SCAN_MAX_ROWS`` rows.
+"""
+
+import json
+from collections.abc import Iterator
+
+from django.conf import settings
+from django.core.checks import Error
+from django.core.checks import Tags
+from django.core.checks import register
+from django.db import connections
+from django.http import QueryDict
+
+from django_template.apps.shared.counts import table_row_estimate
+from django_template.apps.shared.facets import FacetSelection
+from django_template.apps.shared.services import list_available_cars
+
+from .views import CARS_ORDERING
+from .views import CARS_PER_PAGE
+
+# Query strings covering every facet of the catalog, alone and combined.
+CATALOG_FILTERS = (
+    "",
+    "transmission=A",
+    "transmission=A&transmission=M",
+    "make=Toyota",
+    "model=Sedan",
+    "make=Toyota&model=Sedan",
+    "year_min=2018&year_max=2020",
+    "color=Red",
+    "price_band=under-50",
+    "price_band=150-plus",
+    "make=Toyota&color=Red&transmission=M",
+)
+
+
+def catalog_querysets():
+    """Yield ``(label, queryset)`` pairs for every filter the catalog offers."""
+    for query in CATALOG_FILTERS:
+        selection = FacetSelection.from_query(QueryDict(query))
+        cars = selection.apply(list_available_cars()).order_by(*CARS_ORDERING)
+        yield f"index({query})", cars[: CARS_PER_PAGE + 1]
+
+
+def sequential_scans(plan: dict) -> Iterator[str]:
+    """Yield the relation names of all sequential scans in an EXPLAIN plan."""
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from sequential_scans(child)
+
+
+@register(Tags.database)
+def check_catalog_query_plans(app_configs, databases=None, **kwargs):
+    errors = []
+    for alias in databases or []:
+        if connections[alias].vendor != "postgresql":
+            continue
+        for label, queryset in catalog_querysets():
+            plan = json.loads(queryset.using(alias).explain(format="json"))
+            for table in sequential_scans(plan[0]["Plan"]):
+                rows = table_row_estimate(table, using=alias)
+                if rows > settings.QUERY_PLAN_SEQ_SCAN_MAX_ROWS:
+                    errors.append(
+                        Error(
+                            f"{label} plans a sequential scan on {table} "
+                            f"(~{rows} rows) in database '{alias}'.",
+                            hint=(
+                                "Add or fix an index for this query, or raise "
+                                "QUERY_PLAN_SEQ_SCAN_MAX_ROWS."
+                            ),
+                            id="web.E001",
+                        ),
+                    )
+    return errors
@@ -0,0 +1,53 @@
+"""Cache for rendered HTMX fragments.
+
+Fragments are stored as rendered bytes in the ``default`` cache. Keys embed
+the data version of the model the fragment is derived from, so any write to
+that model's table makes every cached fragment stale without explicit deletes.
+"""
+
+import hashlib
+from collections.abc import Awaitable
+from collections.abc import Callable
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+from django.http import HttpResponse
+
+from django_template.apps.shared.caching import get_data_version
+
+
+def fragment_cache_key(name: str, model: type[Model], *parts: object) -> str:
+    """Build a cache key for fragment ``name`` under ``model``'s data version."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f"fragment:{name}:{get_data_version(model)}:{digest}"
+
+
+def cached_fragment(key: str, render: Callable[[], HttpResponse]) -> HttpResponse:
+    """
+    Serve the fragment stored under ``key`` or render and store it.
+
+    ``render`` is only called on a cache miss, so on a hit neither the
+    database nor the template engine is touched.
+    """
+    content = cache.get(key)
+    if content is not None:
+        return HttpResponse(content)
+    response = render()
+    if response.status_code == HTTPStatus.OK:
+        cache.set(key, response.content, timeout=settings.FRAGMENT_CACHE_TIMEOUT)
+    return response
+
+
+async def acached_fragment(
+    key: str, render: Callable[[], Awaitable[HttpResponse]]
+) -> HttpResponse:
+    """Async version of :func:`cached_fragment`, for async ``render`` callables."""
+    content = await cache.aget(key)
+    if content is not None:
+        return HttpResponse(content)
+    response = await render()
+    if response.status_code == HTTPStatus.OK:
+        await cache.aset(key, response.content, timeout=settings.FRAGMENT_CACHE_TIMEOUT)
+    return response
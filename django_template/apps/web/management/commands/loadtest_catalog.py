@@ -0,0 +1,132 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+MODES = ("sync", "gthread", "uvicorn")
+
+
+def fetch(url: str) -> tuple[bool, float]:
+    """GET ``url`` and return whether it succeeded and how long it took."""
+    started = time.perf_counter()
+    try:
+        with urlopen(url, timeout=30) as response:  # noqa: S310
+            response.read()
+            ok = response.status == HTTPStatus.OK
+    except (URLError, OSError):
+        ok = False
+    return ok, time.perf_counter() - started
+
+
+def run_load(url: str, requests: int, concurrency: int) -> dict[str, float]:
+    """Send ``requests`` GETs to ``url`` from ``concurrency`` threads."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(fetch, [url] * requests))
+    elapsed = time.perf_counter() - started
+    latencies = [seconds * 1000 for _, seconds in results]
+    return {
+        "requests": len(results),
+        "errors": sum(not ok for ok, _ in results),
+        "rps": len(results) / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": (
+            statistics.quantiles(latencies, n=20)[-1]
+            if len(latencies) > 1
+            else latencies[0]
+        ),
+    }
+
+
+def wait_until_serving(url: str, server: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            msg = f"gunicorn exited with status {server.returncode}."
+            raise CommandError(msg)
+        if fetch(url)[0]:
+            return
+        time.sleep(0.2)
+    msg = f"gunicorn did not serve {url} within {timeout:.0f}s."
+    raise CommandError(msg)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests the car catalog under each gunicorn worker class "
+        "(config/gunicorn.py) and compares throughput and latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--modes",
+            default=",".join(MODES),
+            help="Comma-separated worker classes to compare.",
+        )
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--path", default="/cars", help="Path to request.")
+        parser.add_argument("--port", type=int, default=8123)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Override WEB_CONCURRENCY for the spawned servers.",
+        )
+        parser.add_argument(
+            "--url",
+            default=None,
+            help="Load-test an already running server instead of spawning one.",
+        )
+
+    def handle(self, *args, **options):
+        requests, concurrency = options["requests"], options["concurrency"]
+        if options["url"]:
+            fetch(options["url"])  # Warm up.
+            self.report("external", run_load(options["url"], requests, concurrency))
+            return
+
+        modes = [mode.strip() for mode in options["modes"].split(",") if mode.strip()]
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            msg = f"Unknown worker classes: {', '.join(sorted(unknown))}."
+            raise CommandError(msg)
+
+        url = f"http://127.0.0.1:{options['port']}{options['path']}"
+        for mode in modes:
+            env = {
+                **os.environ,
+                "GUNICORN_WORKER_CLASS": mode,
+                "GUNICORN_BIND": f"127.0.0.1:{options['port']}",
+            }
+            if options["workers"]:
+                env["WEB_CONCURRENCY"] = str(options["workers"])
+            server = subprocess.Popen(  # noqa: S603
+                [sys.executable, "-m", "gunicorn", "-c", "config/gunicorn.py"],
+                cwd=settings.BASE_DIR,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_until_serving(url, server, timeout=60)
+                self.report(mode, run_load(url, requests, concurrency))
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+    def report(self, mode: str, result: dict[str, float]) -> None:
+        self.stdout.write(
+            f"{mode:>8}: {result['rps']:8.1f} req/s, "
+            f"p50 {result['p50']:7.2f} ms, p95 {result['p95']:7.2f} ms, "
+            f"{result['errors']:.0f}/{result['requests']:.0f} errors",
+        )
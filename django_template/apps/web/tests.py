@@ -1 +1,270 @@
-# Create your tests here.
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import path
+from django.urls import reverse
+
+from config.urls import urlpatterns as project_urlpatterns
+from django_template.apps.shared.facets import FACETS
+from django_template.apps.shared.facets import refresh_facet_summary
+from django_template.apps.shared.models.cars.models import Car
+from django_template.apps.web.checks import catalog_querysets
+from django_template.apps.web.checks import check_catalog_query_plans
+from django_template.apps.web.checks import sequential_scans
+from django_template.apps.web.views import CARS_PER_PAGE
+from django_template.apps.web.views import aindex
+from django_template.apps.web.views import apeople
+from django_template.apps.web.views import auser_row_partial
+from django_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+# URLconf routing to the async views, as with settings.ASYNC_VIEWS.
+urlpatterns = [
+    path("people/", apeople, name="people"),
+    path("cars", aindex, name="index"),
+    path("htmx/user-row/<int:pk>/", auser_row_partial, name="user_row_partial"),
+    *project_urlpatterns,
+]
+
+
+def make_cars(count: int, **kwargs) -> list[Car]:
+    defaults = {
+        "make": "Honda",
+        "model": "Coupe",
+        "year": 2021,
+        "color": "Blue",
+        "price_per_day": "80.00",
+        "transmission": "M",
+        "is_available": True,
+    }
+    defaults.update(kwargs)
+    return Car.objects.bulk_create(Car(**defaults) for _ in range(count))
+
+
+class TestIndexView:
+    def test_first_page(self, client: Client):
+        make_cars(CARS_PER_PAGE + 2)
+        make_cars(3, is_available=False)
+
+        response = client.get(reverse("index"))
+
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.context["page_obj"]) == CARS_PER_PAGE
+        assert response.context["car_count"] == CARS_PER_PAGE + 2
+        assert response.context["page_obj"].has_next
+
+    def test_htmx_next_page_with_filter(self, client: Client):
+        make_cars(CARS_PER_PAGE + 1, transmission="A")
+        make_cars(2, transmission="M")
+        url = reverse("index")
+        first = client.get(url, {"transmission": "A"}, headers={"HX-Request": "true"})
+
+        response = client.get(
+            url,
+            {"transmission": "A", "cursor": first.context["page_obj"].next_cursor},
+            headers={"HX-Request": "true"},
+        )
+
+        assert response.templates[0].name == "cotton/car_list.html"
+        assert b'id="car-filters"' in response.content
+        assert b'hx-swap-oob="true"' in response.content
+        cars = list(response.context["page_obj"])
+        assert len(cars) == 1
+        assert cars[0].transmission == "A"
+
+    def test_invalid_year_filter_is_ignored(self, client: Client):
+        make_cars(2)
+
+        response = client.get(reverse("index"), {"year_min": "²", "year_max": "1e9"})
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.context["car_count"] == 2  # noqa: PLR2004
+
+
+class TestCatalogQueryPlanCheck:
+    def test_sequential_scans_walks_nested_plans(self):
+        plan = {
+            "Node Type": "Limit",
+            "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "shared_car"},
+                {
+                    "Node Type": "Index Scan",
+                    "Relation Name": "users_user",
+                    "Plans": [{"Node Type": "Seq Scan", "Relation Name": "other"}],
+                },
+            ],
+        }
+        assert list(sequential_scans(plan)) == ["shared_car", "other"]
+
+    def test_filters_cover_every_facet(self):
+        labels = " ".join(label for label, _queryset in catalog_querysets())
+
+        for facet in FACETS:
+            assert facet.name in labels
+
+    def test_skipped_without_database(self):
+        assert check_catalog_query_plans(None) == []
+
+    def test_passes_on_small_tables(self, settings):
+        settings.QUERY_PLAN_SEQ_SCAN_MAX_ROWS = 10**9
+        assert check_catalog_query_plans(None, databases=["default"]) == []
+
+
+class TestCarListFragmentCache:
+    def test_repeated_htmx_request_skips_database(self, client: Client):
+        make_cars(2)
+        url = reverse("index")
+        first = client.get(url, {"transmission": "M"}, headers={"HX-Request": "true"})
+
+        with CaptureQueriesContext(connection) as queries:
+            second = client.get(
+                url,
+                {"transmission": "M"},
+                headers={"HX-Request": "true"},
+            )
+
+        assert second.content == first.content
+        # Only the ATOMIC_REQUESTS savepoint bookkeeping remains.
+        assert not [q for q in queries if q["sql"].startswith("SELECT")]
+
+    def test_car_change_invalidates_fragment(
+        self, client: Client, django_capture_on_commit_callbacks
+    ):
+        car = make_cars(1)[0]
+        url = reverse("index")
+        client.get(url, headers={"HX-Request": "true"})
+
+        car.pk = None
+        with django_capture_on_commit_callbacks(execute=True):
+            car.save()
+        response = client.get(url, headers={"HX-Request": "true"})
+
+        assert b"2 cars available" in response.content
+
+    def test_facet_refresh_invalidates_fragment(self, client: Client):
+        make_cars(1, make="Lotus")
+        url = reverse("index")
+        client.get(url, headers={"HX-Request": "true"})
+
+        refresh_facet_summary()
+        response = client.get(url, headers={"HX-Request": "true"})
+
+        assert b'value="Lotus"' in response.content
+
+
+class TestPeopleView:
+    def test_streams_all_users(self, client: Client):
+        users = UserFactory.create_batch(3)
+
+        response = client.get(reverse("people"))
+
+        assert response.status_code == HTTPStatus.OK
+        assert isinstance(response, StreamingHttpResponse)
+        content = b"".join(response.streaming_content).decode()
+        assert content.count('<tr id="user-') == len(users)
+        assert content.rstrip().endswith("</html>")
+
+    def test_streams_empty_table(self, client: Client):
+        response = client.get(reverse("people"))
+        assert isinstance(response, StreamingHttpResponse)
+        assert b"No users" in b"".join(response.streaming_content)
+
+    def test_infinite_scroll(self, client: Client, monkeypatch):
+        monkeypatch.setattr("django_template.apps.web.views.PEOPLE_PER_PAGE", 2)
+        users = UserFactory.create_batch(3)
+
+        first = client.get(reverse("people"), {"mode": "scroll"})
+        next_url = first.context["next_url"]
+        rest = client.get(next_url, headers={"HX-Request": "true"})
+
+        assert [u.pk for u in first.context["users"]] == [u.pk for u in users[:2]]
+        assert b'hx-trigger="revealed"' in first.content
+        assert rest.templates[0].name == "htmx_partials/user_rows.html"
+        assert [u.pk for u in rest.context["users"]] == [users[2].pk]
+        assert rest.context["next_url"] is None
+
+
+class TestUserRowsPartial:
+    def test_refreshes_many_rows_in_one_query(self, client: Client):
+        users = UserFactory.create_batch(3)
+        ids = f"{users[0].pk},{users[2].pk}"
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse("user_rows_partial"), {"ids": ids})
+
+        selects = [q for q in queries if q["sql"].startswith("SELECT")]
+        assert len(selects) == 1
+        content = response.content.decode()
+        assert content.count('hx-swap-oob="true"') == 2  # noqa: PLR2004
+        assert f'id="user-{users[1].pk}"' not in content
+
+    def test_ignores_invalid_ids(self, client: Client):
+        response = client.get(
+            reverse("user_rows_partial"),
+            {"ids": ["abc", "", "²", "1²", "-1", str(2**64)]},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.content.strip() == b""
+
+
+@pytest.mark.urls(__name__)
+class TestAsyncViews:
+    def test_index(self, client: Client):
+        make_cars(CARS_PER_PAGE + 1)
+
+        response = client.get(reverse("index"))
+        cursor = response.context["page_obj"].next_cursor
+        rest = client.get(
+            reverse("index"), {"cursor": cursor}, headers={"HX-Request": "true"}
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.context["car_count"] == CARS_PER_PAGE + 1
+        assert len(rest.context["page_obj"]) == 1
+        assert b'hx-swap-oob="true"' in rest.content
+
+    def test_people_streams_all_users(self, client: Client):
+        users = UserFactory.create_batch(3)
+
+        response = client.get(reverse("people"))
+        assert isinstance(response, StreamingHttpResponse)
+
+        async def collect():
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        content = async_to_sync(collect)().decode()
+        assert content.count('<tr id="user-') == len(users)
+        assert content.rstrip().endswith("</html>")
+
+    def test_user_row_partial(self, client: Client):
+        user = UserFactory()
+
+        response = client.get(reverse("user_row_partial", args=[user.pk]))
+        missing = client.get(reverse("user_row_partial", args=[user.pk + 1]))
+
+        assert f'id="user-{user.pk}"'.encode() in response.content
+        assert missing.status_code == HTTPStatus.NOT_FOUND
+
+
+class TestLoadtestCatalog:
+    def test_against_running_server(self, live_server):
+        out = StringIO()
+        call_command(
+            "loadtest_catalog",
+            "--url",
+            f"{live_server.url}/cars",
+            "--requests",
+            "4",
+            "--concurrency",
+            "2",
+            stdout=out,
+        )
+        assert "0/4 errors" in out.getvalue()
@@ -1,11 +1,20 @@
+from django.conf import settings
 from django.urls import path
 
+from .views import aindex
+from .views import apeople
+from .views import auser_row_partial
 from .views import index
 from .views import people
 from .views import user_row_partial
+from .views import user_rows_partial
+
+if settings.ASYNC_VIEWS:
+    index, people, user_row_partial = aindex, apeople, auser_row_partial
 
 urlpatterns = [
     path("people/", people, name="people"),
     path("cars", index, name="index"),
     path("htmx/user-row/<int:pk>/", user_row_partial, name="user_row_partial"),
+    path("htmx/user-rows/", user_rows_partial, name="user_rows_partial"),
 ]
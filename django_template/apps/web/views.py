@@ -1,40 +1,250 @@
+from collections.abc import AsyncIterator
+from collections.abc import Iterator
+from itertools import batched
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
-from django.core.paginator import Paginator
 from django.http import HttpRequest
 from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.shortcuts import aget_object_or_404
 from django.shortcuts import get_object_or_404
 from django.shortcuts import render
+from django.template.loader import get_template
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.views.decorators.http import require_GET
 
+from django_template.apps.shared.caching import get_data_version
+from django_template.apps.shared.counts import cached_count
+from django_template.apps.shared.facets import FacetSelection
+from django_template.apps.shared.facets import facet_counts
 from django_template.apps.shared.models.cars.models import Car
+from django_template.apps.shared.models.cars.models import CarFacetCount
+from django_template.apps.shared.pagination import KeysetPage
+from django_template.apps.shared.pagination import KeysetPaginator
+from django_template.apps.shared.services import get_users
+from django_template.apps.shared.services import list_available_cars
 from django_template.apps.shared.services import list_users
+from django_template.apps.shared.transactions import read_only
+
+from .fragments import acached_fragment
+from .fragments import cached_fragment
+from .fragments import fragment_cache_key
 
 User = get_user_model()
 
+CARS_PER_PAGE = 5
+CARS_ORDERING = ("id",)
+PEOPLE_PER_PAGE = 50
+PEOPLE_CHUNK_SIZE = 500
+USER_ROWS_PLACEHOLDER = "__USER_ROWS__"
+USER_ROWS_BATCH_LIMIT = 200
+MAX_PK = 2**63 - 1
 
+
+@read_only
 @require_GET
-def people(request: HttpRequest) -> HttpResponse:
-    users = list_users()
-    return render(request, "web/user_list.html", {"users": users})
+def people(request: HttpRequest) -> HttpResponseBase:
+    """
+    List all users.
+
+    By default the whole table is streamed in chunks straight from a database
+    cursor, so memory stays flat regardless of the number of users. With
+    ``?mode=scroll`` only the first page is rendered and HTMX loads the next
+    page whenever the last row scrolls into view.
+    """
+    if "HX-Request" in request.headers or request.GET.get("mode") == "scroll":
+        paginator = KeysetPaginator(list_users(), PEOPLE_PER_PAGE)
+        page = paginator.get_page(request.GET.get("cursor"))
+        return render(request, *people_page(request, page))
+
+    html = render_to_string(
+        "web/user_list.html",
+        {"rows_placeholder": USER_ROWS_PLACEHOLDER},
+        request=request,
+    )
+    head, tail = html.split(USER_ROWS_PLACEHOLDER)
+    return StreamingHttpResponse(
+        stream_user_rows(head, tail),
+        content_type="text/html; charset=utf-8",
+    )
+
+
+def people_page(request: HttpRequest, page: KeysetPage) -> tuple[str, dict]:
+    """Return the template and context rendering one page of people."""
+    context = {
+        "users": page,
+        "next_url": (
+            f"{reverse('people')}?cursor={page.next_cursor}" if page.has_next else None
+        ),
+    }
+    if "HX-Request" in request.headers:
+        return "htmx_partials/user_rows.html", context
+    return "web/user_list.html", context
 
 
+def stream_user_rows(head: str, tail: str) -> Iterator[str]:
+    """Yield ``head``, the user rows in rendered chunks, then ``tail``."""
+    yield head
+    rows_template = get_template("htmx_partials/user_rows.html")
+    users = list_users().iterator(chunk_size=PEOPLE_CHUNK_SIZE)
+    empty = True
+    for chunk in batched(users, PEOPLE_CHUNK_SIZE, strict=False):
+        empty = False
+        yield rows_template.render({"users": chunk})
+    if empty:
+        yield rows_template.render({"users": []})
+    yield tail
+
+
+@read_only
 @require_GET
 def user_row_partial(request: HttpRequest, pk: int) -> HttpResponse:
     u = get_object_or_404(User, pk=pk)
     return render(request, "htmx_partials/user_row.html", {"u": u})
 
 
+@read_only
+@require_GET
+def user_rows_partial(request: HttpRequest) -> HttpResponse:
+    """
+    Refresh many user rows in one request.
+
+    Accepts ``ids`` as repeated or comma-separated query parameters, loads the
+    users with a single ``id__in`` query and returns each row as an
+    out-of-band swap fragment.
+    """
+    ids = []
+    for value in request.GET.getlist("ids"):
+        for pk in value.split(","):
+            try:
+                pk_value = int(pk)
+            except ValueError:
+                continue
+            if 0 < pk_value <= MAX_PK:
+                ids.append(pk_value)
+    users = get_users(ids[:USER_ROWS_BATCH_LIMIT]) if ids else []
+    return render(request, "htmx_partials/user_rows_oob.html", {"users": users})
+
+
 # Create your views here.
+@read_only
 def index(request):
-    transmission = request.GET.getlist("transmission")
-    cars = Car.objects.filter(is_available=True)
-    if transmission:
-        cars = cars.filter(transmission__in=transmission)
-
-    paginator = Paginator(cars, 5)
-    page_number = request.GET.get("page", 1)
-    page_obj = paginator.get_page(page_number)
-    context = {"page_obj": page_obj, "car_count": cars.count()}
+    selection = FacetSelection.from_query(request.GET)
+    cursor = request.GET.get("cursor")
+
+    def catalog_context():
+        cars = selection.apply(list_available_cars())
+        paginator = KeysetPaginator(cars, CARS_PER_PAGE, ordering=CARS_ORDERING)
+        return {
+            "page_obj": paginator.get_page(cursor),
+            "car_count": cached_count(cars),
+            "facets": facet_counts(selection),
+        }
+
     if "HX-Request" in request.headers:
-        return render(request, "cotton/car_list.html", context)
-    return render(request, "index.html", context)
+        key = fragment_cache_key(
+            "car-list",
+            Car,
+            request.LANGUAGE_CODE,
+            # The sidebar's counts follow the facet summary, not the cars.
+            get_data_version(CarFacetCount),
+            selection.cache_token(),
+            cursor,
+        )
+        return cached_fragment(
+            key,
+            lambda: render(
+                request,
+                "cotton/car_list.html",
+                # Refresh the facet counts in the sidebar alongside the car list.
+                {**catalog_context(), "swap_filters": True},
+            ),
+        )
+    return render(request, "index.html", catalog_context())
+
+
+# Async variants, routed instead of the views above when settings.ASYNC_VIEWS is
+# set. Queries use the async ORM; template rendering, cached counts and facet
+# counts have no async API and run through sync_to_async.
+@read_only
+@require_GET
+async def apeople(request: HttpRequest) -> HttpResponseBase:
+    """Async version of :func:`people`."""
+    if "HX-Request" in request.headers or request.GET.get("mode") == "scroll":
+        paginator = KeysetPaginator(list_users(), PEOPLE_PER_PAGE)
+        page = await paginator.aget_page(request.GET.get("cursor"))
+        return await sync_to_async(render)(request, *people_page(request, page))
+
+    html = await sync_to_async(render_to_string)(
+        "web/user_list.html",
+        {"rows_placeholder": USER_ROWS_PLACEHOLDER},
+        request=request,
+    )
+    head, tail = html.split(USER_ROWS_PLACEHOLDER)
+    return StreamingHttpResponse(
+        astream_user_rows(head, tail),
+        content_type="text/html; charset=utf-8",
+    )
+
+
+async def astream_user_rows(head: str, tail: str) -> AsyncIterator[str]:
+    """Async version of :func:`stream_user_rows`."""
+    yield head
+    rows_template = get_template("htmx_partials/user_rows.html")
+    chunk = []
+    empty = True
+    async for user in list_users().aiterator(chunk_size=PEOPLE_CHUNK_SIZE):
+        chunk.append(user)
+        if len(chunk) == PEOPLE_CHUNK_SIZE:
+            empty = False
+            yield rows_template.render({"users": chunk})
+            chunk = []
+    if chunk or empty:
+        yield rows_template.render({"users": chunk})
+    yield tail
+
+
+@read_only
+@require_GET
+async def auser_row_partial(request: HttpRequest, pk: int) -> HttpResponse:
+    """Async version of :func:`user_row_partial`."""
+    u = await aget_object_or_404(User, pk=pk)
+    return await sync_to_async(render)(request, "htmx_partials/user_row.html", {"u": u})
+
+
+@read_only
+async def aindex(request):
+    """Async version of :func:`index`."""
+    selection = FacetSelection.from_query(request.GET)
+    cursor = request.GET.get("cursor")
+
+    async def catalog_context():
+        cars = selection.apply(list_available_cars())
+        paginator = KeysetPaginator(cars, CARS_PER_PAGE, ordering=CARS_ORDERING)
+        return {
+            "page_obj": await paginator.aget_page(cursor),
+            "car_count": await sync_to_async(cached_count)(cars),
+            "facets": await sync_to_async(facet_counts)(selection),
+        }
+
+    if "HX-Request" in request.headers:
+        summary_version = await sync_to_async(get_data_version)(CarFacetCount)
+        key = await sync_to_async(fragment_cache_key)(
+            "car-list",
+            Car,
+            request.LANGUAGE_CODE,
+            summary_version,
+            selection.cache_token(),
+            cursor,
+        )
+
+        async def render_car_list():
+            context = {**await catalog_context(), "swap_filters": True}
+            return await sync_to_async(render)(request, "cotton/car_list.html", context)
+
+        return await acached_fragment(key, render_car_list)
+    context = await catalog_context()
+    return await sync_to_async(render)(request, "index.html", context)
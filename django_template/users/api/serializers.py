@@ -1,9 +1,12 @@
 from rest_framework import serializers
 
+from django_template.apps.api.fields import CachedHyperlinkedIdentityField
 from django_template.users.models import User
 
 
 class UserSerializer(serializers.ModelSerializer[User]):
+    serializer_url_field = CachedHyperlinkedIdentityField
+
     class Meta:
         model = User
         fields = ["name", "url"]
@@ -1,3 +1,11 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import get_script_prefix
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from django.utils.cache import patch_vary_headers
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.mixins import ListModelMixin
@@ -6,6 +14,8 @@ from rest_framework.mixins import UpdateModelMixin
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from django_template.apps.shared.caching import get_data_version
+from django_template.apps.shared.routers import use_primary
 from django_template.users.models import User
 
 from .serializers import UserSerializer
@@ -22,5 +32,42 @@ class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericV
 
     @action(detail=False)
     def me(self, request):
-        serializer = UserSerializer(request.user, context={"request": request})
-        return Response(status=status.HTTP_200_OK, data=serializer.data)
+        """
+        Return the current user, cached per user and per data version.
+
+        The payload is rebuilt only after the user is saved; in between,
+        clients revalidating with ``If-None-Match`` get ``304 Not Modified``.
+        """
+        user = request.user
+        # Read before the row: request.user may predate a save whose version is
+        # already bumped, and must not be cached under that version.
+        version = get_data_version(User, user.pk)
+        # Hyperlinks embed the scheme, host and script prefix of the request.
+        base_url = f"{request.scheme}://{request.get_host()}{get_script_prefix()}"
+        variant = hashlib.blake2b(
+            "|".join(
+                (
+                    base_url,
+                    request.META.get("HTTP_ACCEPT", ""),
+                    request.META.get("QUERY_STRING", ""),
+                ),
+            ).encode(),
+            digest_size=8,
+        ).hexdigest()
+        etag = f'W/"{user.pk}-{version}-{variant}"'
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            key = f"api:me:{user.pk}:{version}:{base_url}"
+            data = cache.get(key)
+            if data is None:
+                with use_primary():
+                    current = User.objects.get(pk=user.pk)
+                serializer = UserSerializer(current, context={"request": request})
+                data = serializer.data
+                cache.set(key, data, timeout=settings.API_ME_CACHE_TIMEOUT)
+            response = Response(status=status.HTTP_200_OK, data=data)
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Authorization", "Cookie"))
+        return response
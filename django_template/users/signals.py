@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from django_template.apps.shared.caching import bump_data_version_on_commit
+
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, using, **kwargs):
+    """Invalidate cached payloads and validators derived from the user table."""
+    bump_data_version_on_commit(User, using=using)
+    bump_data_version_on_commit(User, instance.pk, using=using)
@@ -1,6 +1,10 @@
+from http import HTTPStatus
+
 import pytest
+from rest_framework.test import APIClient
 from rest_framework.test import APIRequestFactory
 
+from django_template.apps.shared.caching import bump_data_version
 from django_template.users.api.views import UserViewSet
 from django_template.users.models import User
 
@@ -32,3 +36,34 @@ class TestUserViewSet:
             "url": f"http://testserver/api/users/{user.pk}/",
             "name": user.name,
         }
+
+    def test_me_not_modified_until_saved(
+        self, user: User, django_capture_on_commit_callbacks
+    ):
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.get("/api/users/me/")
+        etag = response["ETag"]
+        assert "private" in response["Cache-Control"]
+
+        cached = client.get("/api/users/me/", HTTP_IF_NONE_MATCH=etag)
+        assert cached.status_code == HTTPStatus.NOT_MODIFIED
+
+        user.name = "Renamed"
+        with django_capture_on_commit_callbacks(execute=True):
+            user.save()
+        changed = client.get("/api/users/me/", HTTP_IF_NONE_MATCH=etag)
+        assert changed.status_code == HTTPStatus.OK
+        assert changed.json()["name"] == "Renamed"
+
+    def test_me_caches_the_row_read_after_the_version(self, user: User):
+        client = APIClient()
+        # request.user was loaded before a save that has since committed.
+        client.force_authenticate(user)
+        User.objects.filter(pk=user.pk).update(name="Renamed")
+        bump_data_version(User, user.pk)
+
+        response = client.get("/api/users/me/")
+
+        assert response.json()["name"] == "Renamed"